@@ -1,21 +1,24 @@
-import csv
+import os
+import sys
 
+from aggregator import stream_aggregate
 
-total_marks = {}
 
-with open("students.csv", "r") as file:
-    reader = csv.DictReader(file)
-    
-    for row in reader:
-        name = row["Name"]
-        marks = int(row["Marks"])
-        
-        
-        if name in total_marks:
-            total_marks[name] += marks
-        else:
-            total_marks[name] = marks
+# Total marks per student, streamed so the file never has to fit in memory.
+# Pass a worker count to split large files across processes: python Aggregate.py 4
+# With --cached the two columns are read from the columnar cache (CSV/columnar_cache.py),
+# which is much faster for repeated runs over the same file.
+if __name__ == "__main__":
+    if "--cached" in sys.argv:
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CSV"))
+        from columnar_cache import read_csv_cached
 
+        df = read_csv_cached("students.csv", columns=["Name", "Marks"])
+        sums = df.groupby("Name", sort=False)["Marks"].sum()
+        total_marks = {(name,): {"Marks_sum": marks} for name, marks in sums.items()}
+    else:
+        workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+        total_marks = stream_aggregate("students.csv", ["Name"], [("Marks", "sum")], workers=workers)
 
-for name, marks in total_marks.items():
-    print(name, "=", marks)
+    for (name,), result in total_marks.items():
+        print(name, "=", result["Marks_sum"])
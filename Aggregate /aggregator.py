@@ -0,0 +1,141 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Streaming group-by for CSV files in constant memory (one small state per group).
+# Supported functions: sum, count, min, max, mean.
+#
+#   stream_aggregate("students.csv", ["Name"], [("Marks", "sum"), ("Marks", "mean")])
+#   -> {("Anita",): {"Marks_sum": 170, "Marks_mean": 85.0}, ...}
+#
+# With workers > 1 the file is split into byte ranges that are aggregated in
+# separate processes and merged. This assumes no quoted newlines inside fields.
+
+FUNCTIONS = ("sum", "count", "min", "max", "mean")
+
+
+def _number(value):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _new_state():
+    # [count, sum, min, max]
+    return [0, 0, None, None]
+
+
+def _update(state, value):
+    state[0] += 1
+    state[1] += value
+    if state[2] is None or value < state[2]:
+        state[2] = value
+    if state[3] is None or value > state[3]:
+        state[3] = value
+
+
+def _merge_state(state, other):
+    state[0] += other[0]
+    state[1] += other[1]
+    if other[2] is not None and (state[2] is None or other[2] < state[2]):
+        state[2] = other[2]
+    if other[3] is not None and (state[3] is None or other[3] > state[3]):
+        state[3] = other[3]
+
+
+def aggregate_rows(rows, keys, columns):
+    # rows: iterable of dicts. Returns {group: {column: state}}
+    partial = {}
+    for row in rows:
+        group = tuple(row[key] for key in keys)
+        states = partial.get(group)
+        if states is None:
+            states = partial[group] = {column: _new_state() for column in columns}
+        for column in columns:
+            value = row[column]
+            if value != "" and value is not None:
+                _update(states[column], _number(value))
+    return partial
+
+
+def merge_partials(partials):
+    merged = {}
+    for partial in partials:
+        for group, states in partial.items():
+            if group not in merged:
+                merged[group] = states
+            else:
+                for column, state in states.items():
+                    _merge_state(merged[group][column], state)
+    return merged
+
+
+def finalize(partial, metrics):
+    results = {}
+    for group, states in partial.items():
+        out = {}
+        for column, function in metrics:
+            count, total, low, high = states[column]
+            if function == "sum":
+                out[f"{column}_sum"] = total
+            elif function == "count":
+                out[f"{column}_count"] = count
+            elif function == "min":
+                out[f"{column}_min"] = low
+            elif function == "max":
+                out[f"{column}_max"] = high
+            else:
+                out[f"{column}_mean"] = total / count if count else None
+        results[group] = out
+    return results
+
+
+def _read_header(filename):
+    with open(filename, "r", newline="", encoding="utf-8") as file:
+        return next(csv.reader(file))
+
+
+def _byte_ranges(filename, parts):
+    size = os.path.getsize(filename)
+    bounds = [size * i // parts for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+
+def _aggregate_range(filename, start, end, header, keys, columns):
+    # A line belongs to the range its first byte falls in
+    with open(filename, "rb") as file:
+        if start == 0:
+            file.readline()  # header
+        else:
+            file.seek(start - 1)
+            file.readline()  # finish the line that started before this range
+
+        def lines():
+            while file.tell() < end:
+                line = file.readline()
+                if not line:
+                    break
+                yield line.decode("utf-8")
+
+        rows = (dict(zip(header, values)) for values in csv.reader(lines()) if values)
+        return aggregate_rows(rows, keys, columns)
+
+
+def stream_aggregate(filename, keys, metrics, workers=1):
+    for column, function in metrics:
+        if function not in FUNCTIONS:
+            raise ValueError(f"Unknown aggregate '{function}', use one of {FUNCTIONS}")
+    columns = sorted({column for column, _ in metrics})
+
+    if workers <= 1:
+        with open(filename, "r", newline="", encoding="utf-8") as file:
+            partial = aggregate_rows(csv.DictReader(file), keys, columns)
+    else:
+        header = _read_header(filename)
+        ranges = _byte_ranges(filename, workers)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_aggregate_range, filename, start, end, header, keys, columns)
+                       for start, end in ranges]
+            partial = merge_partials(future.result() for future in futures)
+    return finalize(partial, metrics)
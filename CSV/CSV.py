@@ -18,3 +18,15 @@ with open('students.csv', mode='r') as file:
     print("\nReading data from students.csv:")
     for row in reader:
         print(row)
+
+# The same file with a declared schema (typed_csv.py): buffered batch writes,
+# and reads that return one typed column per field
+from typed_csv import TypedWriter, read_columns
+
+schema = [('Name', str), ('Age', int), ('Course', str)]
+with TypedWriter('students.csv', schema) as writer:
+    writer.writerows([['Madhu', 21, 'Python'], ['John', 22, 'Java'], ['Anita', 20, 'DSA']])
+
+print("\nTyped columns from students.csv:")
+for name, column in read_columns('students.csv', schema).items():
+    print(name, column)
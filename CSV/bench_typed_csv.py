@@ -0,0 +1,81 @@
+# Benchmark: stdlib csv (row at a time, as in CSV.py) vs typed_csv.py
+# Usage: python bench_typed_csv.py [rows]      (default 10,000,000)
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from typed_csv import TypedWriter, read_columns, read_columns_mmap
+
+SCHEMAS = {
+    "mixed": [("Name", str), ("Age", int), ("Score", float)],
+    "numeric": [("Id", int), ("Age", int), ("Score", float)],
+}
+
+
+def make_rows(schema, rows):
+    rng = np.random.default_rng(0)
+    ages = rng.integers(18, 90, rows).tolist()
+    scores = rng.normal(70, 10, rows).round(2).tolist()
+    first = [f"student{i}" for i in range(rows)] if schema[0][1] is str else list(range(rows))
+    return list(zip(first, ages, scores))
+
+
+def stdlib_write(filename, schema, rows):
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([name for name, _ in schema])
+        for row in rows:
+            writer.writerow(row)
+
+
+def stdlib_read(filename, schema):
+    # csv.reader plus per-value conversion into one list per column
+    columns = [[] for _ in schema]
+    with open(filename, newline="") as file:
+        reader = csv.reader(file)
+        next(reader)
+        for row in reader:
+            for column, (_, kind), value in zip(columns, schema, row):
+                column.append(kind(value))
+    return columns
+
+
+def typed_write(filename, schema, rows):
+    with TypedWriter(filename, schema) as writer:
+        writer.writerows(rows)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    with tempfile.TemporaryDirectory() as folder:
+        for label, schema in SCHEMAS.items():
+            data = make_rows(schema, rows)
+            plain_file, typed_file = os.path.join(folder, "plain.csv"), os.path.join(folder, "typed.csv")
+
+            _, write_plain = timed(stdlib_write, plain_file, schema, data)
+            _, write_typed = timed(typed_write, typed_file, schema, data)
+            del data
+            expected, read_plain = timed(stdlib_read, plain_file, schema)
+            columns, read_typed = timed(read_columns, typed_file, schema, True)
+            mapped, read_mmap = timed(read_columns_mmap, typed_file, schema, True)
+
+            # Every reader must return the same values
+            for values, (name, _) in zip(expected, schema):
+                assert list(columns[name]) == values and list(mapped[name]) == values, name
+
+            print(f"{label:8} {rows:,} rows: write csv {write_plain:6.2f}s  typed {write_typed:6.2f}s "
+                  f"(x{write_plain / write_typed:.1f}) | read csv {read_plain:6.2f}s  "
+                  f"typed {read_typed:6.2f}s (x{read_plain / read_typed:.1f})  "
+                  f"mmap {read_mmap:6.2f}s (x{read_plain / read_mmap:.1f})")
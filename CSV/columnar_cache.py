@@ -0,0 +1,121 @@
+# Transparent columnar cache for CSV files, shared by the pandas data scripts.
+#
+# The first read_csv_cached("data.csv") parses the CSV as usual and stores the
+# result as Parquet (or Feather) in a .csv_cache folder next to it. Later reads
+# with the same file size, modification time and read options load the columnar
+# copy instead - only the requested columns, if `columns` is given.
+#
+#   df = read_csv_cached("sample_data.csv", columns=["Name", "Age"])
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+CACHE_DIR_NAME = ".csv_cache"
+
+
+def _format():
+    # Parquet and Feather both need pyarrow; without it the cache is a pickle (no projection)
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        return "pickle"
+
+
+def _digest(value):
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def cache_path(csv_file, cache_dir=None, **read_options):
+    path = os.path.abspath(csv_file)
+    stat = os.stat(path)
+    cache_dir = cache_dir or os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    options = _digest(json.dumps(read_options, sort_keys=True, default=str))
+    version = _digest(f"{stat.st_size}:{stat.st_mtime_ns}")
+    # <stem>-<path>-<read options>-<file version>: each set of read options has its own entry
+    return os.path.join(cache_dir, f"{stem}-{_digest(path)}-{options}-{version}.{_format()}")
+
+
+def _read_cache(path, columns):
+    if path.endswith(".parquet"):
+        if columns is not None:
+            import pyarrow.parquet as pq
+            wanted = set(columns)
+            columns = [c for c in pq.read_schema(path).names if c in wanted]
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_pickle(path)
+
+
+def _project(df, columns):
+    # usecols semantics: the requested columns in file order, all of them present
+    if columns is None:
+        return df
+    missing = set(columns).difference(df.columns)
+    if missing:
+        raise ValueError(f"Usecols do not match columns, columns expected but not found: {sorted(missing)}")
+    wanted = set(columns)
+    return df[[c for c in df.columns if c in wanted]]
+
+
+def _write_cache(path, df):
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    # Drop older versions of the same CSV read with the same options
+    prefix = os.path.basename(path).rsplit("-", 1)[0] + "-"
+    for name in os.listdir(folder):
+        if name.startswith(prefix):
+            os.remove(os.path.join(folder, name))
+    tmp_path = path + ".tmp"
+    if path.endswith(".parquet"):
+        # index=None keeps an index_col index; a default RangeIndex is stored as metadata only
+        df.to_parquet(tmp_path, index=None)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_csv_cached(csv_file, columns=None, cache_dir=None, **read_options):
+    # Drop-in for pd.read_csv(csv_file, usecols=columns, **read_options) backed by the cache.
+    # Chunked reads (chunksize/iterator), and index_col together with columns (where
+    # usecols decides which column becomes the index), are passed straight to pandas.
+    index_col = read_options.get("index_col")
+    if ("chunksize" in read_options or read_options.get("iterator")
+            or (columns is not None and index_col is not None and index_col is not False)):
+        return pd.read_csv(csv_file, usecols=columns, **read_options)
+
+    path = cache_path(csv_file, cache_dir, **read_options)
+    if os.path.exists(path):
+        try:
+            df = _read_cache(path, columns)
+        except Exception:
+            pass  # unreadable cache file: rebuild it below
+        else:
+            return _project(df, columns)
+
+    # Cache the whole file once so any later column projection can be served
+    df = pd.read_csv(csv_file, **read_options)
+    try:
+        _write_cache(path, df)
+    except Exception as e:
+        print(f"(columnar cache not written for {csv_file}: {e})")
+    return _project(df, columns)
+
+
+if __name__ == "__main__":
+    # Timing check: python columnar_cache.py data.csv [column ...]
+    import sys
+    import time
+
+    csv_file, columns = sys.argv[1], sys.argv[2:] or None
+    start = time.perf_counter()
+    pd.read_csv(csv_file, usecols=columns)
+    plain = time.perf_counter() - start
+    read_csv_cached(csv_file)  # make sure the cache exists
+    start = time.perf_counter()
+    read_csv_cached(csv_file, columns=columns)
+    cached = time.perf_counter() - start
+    print(f"read_csv {plain * 1000:.1f} ms, cached {cached * 1000:.1f} ms (x{plain / cached:.1f})")
@@ -0,0 +1,132 @@
+# Opt-in memory-compact loading for the pandas data scripts.
+#
+# A sample of the CSV decides which text columns are low-cardinality; those are
+# read straight into `category`. After the read every integer column is
+# downcast to the smallest integer type that holds its actual min/max. Float
+# columns stay float64 unless downcast_floats=True: float32 holds the loaded values
+# exactly but rounds anything computed into the column later (e.g. a filled-in
+# mean), which changes what the scripts write. Numeric types are chosen
+# from the full column rather than the sample, because read_csv wraps values
+# that overflow a narrow dtype silently.
+#
+#   df = read_csv_compact("data.csv")   # prints a before/after memory report
+
+import numpy as np
+import pandas as pd
+
+from columnar_cache import read_csv_cached
+
+SAMPLE_ROWS = 100_000
+MAX_CATEGORY_RATIO = 0.5
+
+
+def infer_categories(csv_file, sample_rows=SAMPLE_ROWS, max_ratio=MAX_CATEGORY_RATIO, **read_options):
+    # Text columns whose distinct values are at most max_ratio of the sampled rows
+    sample = pd.read_csv(csv_file, nrows=sample_rows, **read_options)
+    dtypes = {}
+    for column in sample.columns:
+        values = sample[column]
+        if values.dtype.kind in "biufcmM" or not len(values):
+            continue
+        if values.nunique(dropna=True) <= max_ratio * len(values):
+            dtypes[column] = "category"
+    return dtypes
+
+
+def downcast_numeric(df, downcast_floats=False):
+    # In place; exact for every loaded value
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind in "iu":
+            df[column] = pd.to_numeric(values, downcast="unsigned" if values.min() >= 0 else "integer")
+        elif downcast_floats and values.dtype == np.float64:
+            narrow = values.astype(np.float32)
+            if np.array_equal(narrow.to_numpy(dtype=np.float64), values.to_numpy(), equal_nan=True):
+                df[column] = narrow
+    return df
+
+
+def default_dtype(values):
+    # The dtype read_csv gives the column without the compact options
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.categories.dtype
+    if values.dtype.kind in "iu":
+        return np.dtype(np.int64)
+    if values.dtype == np.float32:
+        return np.dtype(np.float64)
+    return values.dtype
+
+
+def _as_default(values):
+    dtype = default_dtype(values)
+    return values if values.dtype == dtype else values.astype(dtype)
+
+
+def default_memory(df):
+    # What memory_usage(deep=True) would report with read_csv's default dtypes,
+    # rebuilt one column at a time so the full default frame never exists
+    total = df.index.memory_usage()
+    for column in df.columns:
+        total += _as_default(df[column]).memory_usage(index=False, deep=True)
+    return total
+
+
+def memory_report(df):
+    before = default_memory(df)
+    after = df.memory_usage(deep=True).sum()
+    lines = [f"{'column':<16}{'dtype':>12}{'before':>12}{'after':>12}"]
+    for column in df.columns:
+        values = df[column]
+        lines.append(f"{str(column):<16}{str(values.dtype):>12}"
+                     f"{_as_default(values).memory_usage(index=False, deep=True) / 2**20:>10.2f}MB"
+                     f"{values.memory_usage(index=False, deep=True) / 2**20:>10.2f}MB")
+    lines.append(f"Memory: {before / 2**20:.2f} MB -> {after / 2**20:.2f} MB (x{before / max(1, after):.1f} smaller)")
+    return "\n".join(lines)
+
+
+def read_csv_compact(csv_file, columns=None, sample_rows=SAMPLE_ROWS, max_ratio=MAX_CATEGORY_RATIO,
+                     report=True, downcast_floats=False, **read_options):
+    # Drop-in for read_csv_cached(csv_file, columns, **read_options) with compact dtypes
+    categories = infer_categories(csv_file, sample_rows, max_ratio, **read_options)
+    if columns is not None:
+        categories = {c: t for c, t in categories.items() if c in columns}
+    dtype = {**categories, **read_options.pop("dtype", {})}
+    df = read_csv_cached(csv_file, columns=columns, dtype=dtype, **read_options)
+    downcast_numeric(df, downcast_floats)
+    if report:
+        print(memory_report(df))
+    return df
+
+
+def _check(rows=51, sample_rows=10):
+    # Values that only appear after the sample: an empty cell, text in a numeric
+    # column, a value past the sample's integer range. The compact frame must hold
+    # the same values as read_csv, and the report must price read_csv's own dtypes.
+    import os
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_file = os.path.join(folder, "late_values.csv")
+        with open(csv_file, "w") as file:
+            file.write("city,count,code,total\n")
+            for i in range(rows):
+                late = i >= rows - 1
+                file.write(f"{'Chennai' if i % 2 else 'Pune'},{'' if late else i},"
+                           f"{'x1' if late else i % 7},{10**12 if late else i}\n")
+        expected = pd.read_csv(csv_file)
+        df = read_csv_compact(csv_file, sample_rows=sample_rows)
+        for column in expected.columns:
+            assert default_dtype(df[column]) == expected[column].dtype, column
+            assert df[column].astype(expected[column].dtype).equals(expected[column]), column
+        assert default_memory(df) == expected.memory_usage(deep=True).sum()
+    print("compact_dtypes check passed")
+
+
+if __name__ == "__main__":
+    # python compact_dtypes.py data.csv   |   python compact_dtypes.py --check
+    import sys
+
+    if sys.argv[1] == "--check":
+        _check()
+    else:
+        read_csv_compact(sys.argv[1])
@@ -0,0 +1,193 @@
+# Typed, buffered CSV reading and writing.
+#
+# A schema declares the columns once, as (name, type) pairs with type int, float
+# or str. Writing goes through large file buffers and batched writerows calls;
+# reading parses straight into one typed column per field - array('q') for int,
+# array('d') for float, a list for str - or NumPy arrays with as_numpy=True.
+#
+#   schema = [("Name", str), ("Age", int), ("Score", float)]
+#   with TypedWriter("students.csv", schema) as writer:
+#       writer.writerows(rows)
+#   columns = read_columns("students.csv", schema)            # {"Age": array('q', ...), ...}
+#   columns = read_columns_mmap("students.csv", schema, as_numpy=True)
+#
+# Both readers cut the file into blocks of whole records. A block without quote
+# characters is split with plain str.split; quoted blocks go through csv.reader.
+
+import csv
+import io
+import itertools
+import mmap
+import os
+from array import array
+
+import numpy as np
+
+TYPECODES = {int: "q", float: "d"}
+BUFFER_SIZE = 1 << 20
+BATCH_ROWS = 10_000
+
+
+def _check_schema(schema):
+    schema = [(name, kind) for name, kind in schema]
+    for name, kind in schema:
+        if kind not in (int, float, str):
+            raise ValueError(f"Column '{name}' must be int, float or str, not {kind!r}")
+    return schema
+
+
+def _empty_columns(schema):
+    return [array(TYPECODES[kind]) if kind in TYPECODES else [] for _, kind in schema]
+
+
+def _to_numpy(column, kind):
+    if kind in TYPECODES:
+        return np.frombuffer(column, dtype=np.int64 if kind is int else np.float64)
+    return np.array(column, dtype=object)
+
+
+class TypedWriter:
+
+    def __init__(self, filename, schema, buffer_size=BUFFER_SIZE, batch_rows=BATCH_ROWS):
+        self.schema = _check_schema(schema)
+        self.batch_rows = batch_rows
+        self.pending = []
+        self.rows_written = 0
+        self.file = open(filename, "w", newline="", buffering=buffer_size)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in self.schema])
+
+    def writerow(self, row):
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_rows:
+            self.flush()
+
+    def writerows(self, rows):
+        self.flush()
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, self.batch_rows))
+            if not batch:
+                break
+            if len(batch[0]) != len(self.schema):
+                raise ValueError(f"Rows have {len(batch[0])} fields, schema has {len(self.schema)}")
+            self.writer.writerows(batch)
+            self.rows_written += len(batch)
+
+    def write_columns(self, columns):
+        # columns: dict name -> sequence (array, list or NumPy array), in any order
+        missing = [name for name, _ in self.schema if name not in columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        values = [columns[name] for name, _ in self.schema]
+        values = [v.tolist() if isinstance(v, (np.ndarray, array)) else v for v in values]
+        self.writerows(zip(*values))
+
+    def flush(self):
+        if self.pending:
+            self.writer.writerows(self.pending)
+            self.rows_written += len(self.pending)
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _extend(column, name, kind, values):
+    if kind is str:
+        column.extend(values)
+    else:
+        try:
+            column.extend(map(kind, values))
+        except ValueError as e:
+            raise ValueError(f"Column '{name}': {e}") from None
+
+
+def _parse_block(text, schema, columns):
+    # text holds whole records. Without quotes every field is split out in one
+    # str.split and each column is a strided slice; otherwise csv.reader parses it.
+    width = len(schema)
+    if '"' not in text:
+        lines = text.replace("\r\n", "\n").split("\n")
+        lines.pop()  # after the final newline
+        # Every line must have exactly width fields, or the strided slices would misalign
+        if all(count == width - 1 for count in map(str.count, lines, itertools.repeat(","))):
+            fields = ",".join(lines).split(",")
+            for i, (column, (name, kind)) in enumerate(zip(columns, schema)):
+                _extend(column, name, kind, fields[i::width])
+            return
+    rows = [row for row in csv.reader(io.StringIO(text)) if row]
+    for row in rows:
+        if len(row) != width:
+            raise ValueError(f"Row {row} has {len(row)} fields, schema has {width}")
+    if rows:
+        for column, (name, kind), values in zip(columns, schema, zip(*rows)):
+            _extend(column, name, kind, values)
+
+
+def _record_end(text):
+    # Length of the leading whole records: up to the last newline outside quotes
+    end = text.rfind("\n") + 1
+    while end and text.count('"', 0, end) % 2:
+        end = text.rfind("\n", 0, end - 1) + 1
+    return end
+
+
+def _check_header(header, schema, filename):
+    names = [name for name, _ in schema]
+    if header != names:
+        raise ValueError(f"{filename}: header {header} does not match schema {names}")
+
+
+def _result(columns, schema, as_numpy):
+    if as_numpy:
+        return {name: _to_numpy(column, kind) for column, (name, kind) in zip(columns, schema)}
+    return {name: column for column, (name, _) in zip(columns, schema)}
+
+
+def read_columns(filename, schema, as_numpy=False, buffer_size=BUFFER_SIZE, encoding="utf-8"):
+    schema = _check_schema(schema)
+    columns = _empty_columns(schema)
+    with open(filename, newline="", encoding=encoding, buffering=buffer_size) as file:
+        _check_header(next(csv.reader([file.readline()]), []), schema, filename)
+        pending = ""
+        for data in iter(lambda: file.read(buffer_size), ""):
+            pending += data
+            end = _record_end(pending)
+            if end:
+                _parse_block(pending[:end], schema, columns)
+                pending = pending[end:]
+        if pending:
+            _parse_block(pending if pending.endswith("\n") else pending + "\n", schema, columns)
+    return _result(columns, schema, as_numpy)
+
+
+def read_columns_mmap(filename, schema, as_numpy=False, block_size=16 * BUFFER_SIZE, encoding="utf-8"):
+    # Blocks of whole records are decoded straight from the memory-mapped file,
+    # without copying it through a read buffer first.
+    schema = _check_schema(schema)
+    columns = _empty_columns(schema)
+    with open(filename, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            _check_header([], schema, filename)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = mm.find(b"\n") + 1 or len(mm)
+            _check_header(next(csv.reader([mm[:start].decode(encoding)]), []), schema, filename)
+            while start < len(mm):
+                end = mm.find(b"\n", min(start + block_size, len(mm)) - 1)
+                end = len(mm) if end == -1 else end + 1
+                # Extend the block while it ends inside a quoted field
+                while end < len(mm) and mm[start:end].count(b'"') % 2:
+                    end = mm.find(b"\n", end)
+                    end = len(mm) if end == -1 else end + 1
+                text = mm[start:end].decode(encoding)
+                _parse_block(text if text.endswith("\n") else text + "\n", schema, columns)
+                start = end
+    return _result(columns, schema, as_numpy)
@@ -1,5 +1,5 @@
 """Image flipping augmentation demo."""
-from utils.common_imports import cv2, np, imshow
+from utils.common_imports import cv2, np, imshow, get_sink
 import sys
 def flip_augments(image_path):
     img = cv2.imread(image_path)
@@ -14,4 +14,5 @@ if __name__=='__main__':
     if len(sys.argv)<2:
         print('Usage: python flip_augmentation.py path/to/image.jpg'); sys.exit(1)
     out = flip_augments(sys.argv[1])
-    imshow('Original | H | V | Both', out)
\ No newline at end of file
+    imshow('Original | H | V | Both', out)
+    get_sink().close()  # raises if a disk sink failed to write an image
\ No newline at end of file
@@ -1,5 +1,5 @@
 """Harris Corner Detection example."""
-from utils.common_imports import cv2, np, imshow
+from utils.common_imports import cv2, np, imshow, get_sink
 import sys
 def detect_harris_corners(image_path, block_size=2, ksize=3, k=0.04, thresh=0.01):
     img = cv2.imread(image_path)
@@ -16,4 +16,5 @@ if __name__=='__main__':
     if len(sys.argv)<2:
         print('Usage: python harris_corner.py path/to/image.jpg'); sys.exit(1)
     out = detect_harris_corners(sys.argv[1])
-    imshow('Harris Corners', out)
\ No newline at end of file
+    imshow('Harris Corners', out)
+    get_sink().close()  # raises if a disk sink failed to write an image
\ No newline at end of file
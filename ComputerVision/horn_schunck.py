@@ -1,5 +1,5 @@
 """Horn-Schunck optical flow (simple educational impl)."""
-from utils.common_imports import cv2, np, imshow
+from utils.common_imports import cv2, np, imshow, get_sink
 import sys
 def horn_schunck(img1, img2, alpha=1.0, num_iter=100):
     u = np.zeros(img1.shape)
@@ -35,4 +35,5 @@ if __name__=='__main__':
             dy = int(v[y,x]*5)
             pt2 = (x+dx, y+dy)
             cv2.arrowedLine(vis, pt1, pt2, (0,255,0),1, tipLength=0.3)
-    imshow('Optical Flow (Horn-Schunck)', vis)
\ No newline at end of file
+    imshow('Optical Flow (Horn-Schunck)', vis)
+    get_sink().close()  # raises if a disk sink failed to write an image
\ No newline at end of file
@@ -1,5 +1,5 @@
 """Mean and Otsu thresholding demo."""
-from utils.common_imports import cv2, np, imshow
+from utils.common_imports import cv2, np, imshow, get_sink
 import sys
 def mean_threshold(image_path, block_size=11, C=2):
     img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
@@ -13,4 +13,5 @@ if __name__=='__main__':
     if len(sys.argv)<2:
         print('Usage: python mean_threshold.py path/to/image.jpg'); sys.exit(1)
     out = mean_threshold(sys.argv[1])
-    imshow('Original | Otsu | Adaptive Mean', out)
\ No newline at end of file
+    imshow('Original | Otsu | Adaptive Mean', out)
+    get_sink().close()  # raises if a disk sink failed to write an image
\ No newline at end of file
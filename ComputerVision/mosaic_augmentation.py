@@ -1,5 +1,5 @@
 """Create a 2x2 mosaic from up to 4 images."""
-from utils.common_imports import cv2, np, imshow
+from utils.common_imports import cv2, np, imshow, get_sink
 import sys
 from pathlib import Path
 def make_mosaic(image_paths, size=(256,256)):
@@ -20,4 +20,5 @@ if __name__=='__main__':
     if len(sys.argv)<2:
         print('Usage: python mosaic_augmentation.py path/to/image1 [image2 ...]'); sys.exit(1)
     out = make_mosaic(sys.argv[1:])
-    imshow('Mosaic', out)
\ No newline at end of file
+    imshow('Mosaic', out)
+    get_sink().close()  # raises if a disk sink failed to write an image
\ No newline at end of file
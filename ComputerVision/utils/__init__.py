@@ -1 +1 @@
-from .common_imports import cv2, np, plt, imshow
+from .common_imports import cv2, np, plt, imshow, DisplaySink, DiskSink, NullSink, get_sink, set_sink, sink_from_env
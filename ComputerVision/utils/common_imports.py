@@ -1,5 +1,10 @@
 """Common imports for ComputerVision scripts."""
+import atexit
+import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 try:
     import cv2
 except Exception as e:
@@ -12,17 +17,129 @@ try:
     import matplotlib.pyplot as plt
 except Exception:
     plt = None
-def imshow(title, image):
-    if plt:
-        plt.figure(figsize=(6,6))
-        if image.ndim==2:
-            plt.imshow(image, cmap='gray')
+class DisplaySink:
+    """Show each image in a blocking window (matplotlib if available, else cv2)."""
+    def write(self, title, image):
+        if plt:
+            plt.figure(figsize=(6,6))
+            if image.ndim==2:
+                plt.imshow(image, cmap='gray')
+            else:
+                plt.imshow(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            plt.title(title)
+            plt.axis('off')
+            plt.show()
         else:
-            plt.imshow(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        plt.title(title)
-        plt.axis('off')
-        plt.show()
-    else:
-        cv2.imshow(title, image)
-        cv2.waitKey(0)
-        cv2.destroyAllWindows()
+            cv2.imshow(title, image)
+            cv2.waitKey(0)
+            cv2.destroyAllWindows()
+    def close(self):
+        pass
+class NullSink:
+    """Discard every image; useful for timing the compute loop on its own."""
+    def write(self, title, image):
+        pass
+    def close(self):
+        pass
+class DiskSink:
+    """Encode images to PNG/JPEG on a background thread pool.
+
+    `compression` is the PNG compression level (0-9) or the JPEG quality
+    (0-100) depending on `ext`. At most `max_pending` images are queued;
+    `write` blocks once the queue is full so memory stays bounded.
+    Encode failures are reported on stderr as they happen and raised by the
+    next `write` or by `close`. The sink is also closed at exit, but failures
+    there are only printed, so batch scripts should call `get_sink().close()`
+    (or `set_sink(...)`) themselves to fail on encode errors.
+    """
+    def __init__(self, out_dir='output', ext='.png', compression=None, max_workers=2, max_pending=32):
+        ext = ext.lower() if ext.startswith('.') else '.' + ext.lower()
+        if ext == '.png':
+            self.params = [cv2.IMWRITE_PNG_COMPRESSION, 3 if compression is None else int(compression)]
+        elif ext in ('.jpg', '.jpeg'):
+            self.params = [cv2.IMWRITE_JPEG_QUALITY, 95 if compression is None else int(compression)]
+        else:
+            raise ValueError(f'Unsupported image extension: {ext}')
+        self.out_dir = out_dir
+        self.ext = ext
+        os.makedirs(out_dir, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._errors = []
+        self._closed = False
+    def _filename(self, title):
+        with self._lock:
+            self._count += 1
+            index = self._count
+        stem = re.sub(r'[^A-Za-z0-9_.-]+', '_', title).strip('_') or 'image'
+        return os.path.join(self.out_dir, f'{index:06d}_{stem}{self.ext}')
+    def _encode(self, path, image):
+        try:
+            if not cv2.imwrite(path, image, self.params):
+                raise IOError(f'Unable to write image: {path}')
+        except Exception as e:
+            print(f'DiskSink: {e}', file=sys.stderr)
+            self._errors.append(e)
+        finally:
+            self._slots.release()
+    def _raise_error(self):
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+    def write(self, title, image):
+        if self._closed:
+            raise RuntimeError('DiskSink is closed')
+        self._raise_error()
+        self._slots.acquire()
+        try:
+            # Copy so the caller can keep reusing its buffer while we encode.
+            self._pool.submit(self._encode, self._filename(title), np.ascontiguousarray(image).copy())
+        except BaseException:
+            self._slots.release()
+            raise
+    def close(self):
+        self._closed = True
+        self._pool.shutdown(wait=True)
+        self._raise_error()
+def sink_from_env(spec=None):
+    """Build a sink from `CV_SINK`: `display` (default), `null`, or `disk[:dir[:ext[:level]]]`."""
+    spec = spec if spec is not None else os.environ.get('CV_SINK', 'display')
+    kind, _, rest = spec.partition(':')
+    if kind == 'null':
+        return NullSink()
+    if kind == 'disk':
+        parts = rest.split(':') if rest else []
+        out_dir = parts[0] if len(parts) > 0 and parts[0] else 'output'
+        ext = parts[1] if len(parts) > 1 and parts[1] else '.png'
+        level = int(parts[2]) if len(parts) > 2 and parts[2] else None
+        return DiskSink(out_dir, ext, level)
+    if kind == 'display':
+        return DisplaySink()
+    raise ValueError(f'Unknown CV_SINK: {spec}')
+_sink = None
+def get_sink():
+    global _sink
+    if _sink is None:
+        _sink = sink_from_env()
+    return _sink
+def set_sink(sink):
+    """Replace the sink used by `imshow`, closing the previous one."""
+    global _sink
+    if _sink is not None and _sink is not sink:
+        _sink.close()
+    _sink = sink
+def _close_sink():
+    # Last-resort flush at exit. It only reports on stderr: an exception here would not
+    # change the exit status either, and a library must not cut short the caller's own
+    # exit handling. Scripts that need a failing exit status close the sink themselves.
+    if _sink is not None:
+        try:
+            _sink.close()
+        except Exception as e:
+            print(f'Closing the image sink failed: {e}', file=sys.stderr)
+atexit.register(_close_sink)
+def imshow(title, image, sink=None):
+    (sink or get_sink()).write(title, image)
@@ -0,0 +1,155 @@
+# Cross-chunk deduplication for data that does not fit in memory.
+#
+# Every row (or a subset of columns) is hashed to 128 bits with two independent
+# vectorized hashes. Two modes:
+#   exact  keeps every row hash in an in-memory set
+#   bloom  keeps a Bloom filter in memory; only rows the filter has probably seen
+#          are checked against the exact hashes kept in a SQLite file on disk
+# A deduplicator is called once per chunk and returns the rows not seen before,
+# like drop_duplicates() over the whole dataset (first occurrence wins).
+
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Two different 16-character keys give two independent 64-bit hashes
+HASH_KEYS = ("dedup-key-000001", "dedup-key-000002")
+
+
+def row_hashes(df, columns=None, normalize=False):
+    # Returns two uint64 arrays; normalize strips and lower-cases text before hashing
+    df = df if columns is None else df[columns]
+    # A column read as int in one chunk and float in another must hash the same
+    numeric = [c for c in df.columns if df[c].dtype.kind in "iuf"]
+    if numeric:
+        df = df.astype({c: "float64" for c in numeric})
+    if normalize:
+        df = df.apply(lambda col: col.str.strip().str.lower()
+                      if pd.api.types.is_string_dtype(col) or col.dtype == object else col)
+    return tuple(pd.util.hash_pandas_object(df, index=False, hash_key=key).to_numpy()
+                 for key in HASH_KEYS)
+
+
+class StreamingDeduplicator:
+
+    def __init__(self, columns=None, mode="exact", expected_rows=10_000_000, fp_rate=0.01,
+                 normalize=False, spill_file=None):
+        if mode not in ("exact", "bloom"):
+            raise ValueError("mode must be 'exact' or 'bloom'")
+        self.columns = columns
+        self.mode = mode
+        self.normalize = normalize
+        self.expected_rows = expected_rows
+        self.rows_seen = 0
+        self.rows_kept = 0
+        if mode == "exact":
+            self.seen = set()
+        else:
+            # Standard Bloom sizing for the expected number of distinct rows
+            self.bits = max(64, int(-expected_rows * math.log(fp_rate) / math.log(2) ** 2))
+            self.k = max(1, round(self.bits / expected_rows * math.log(2)))
+            self.filter = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+            if spill_file is None:
+                handle, spill_file = tempfile.mkstemp(suffix=".dedup.db")
+                os.close(handle)
+                self._remove_spill = True
+            else:
+                self._remove_spill = False
+            self.spill_file = spill_file
+            self.db = sqlite3.connect(spill_file)
+            self.db.execute("PRAGMA synchronous = OFF")
+            self.db.execute("PRAGMA journal_mode = MEMORY")
+            self.db.execute("CREATE TABLE IF NOT EXISTS seen (h1 INTEGER, h2 INTEGER, PRIMARY KEY (h1, h2)) "
+                            "WITHOUT ROWID")
+            self.bloom_positives = 0
+
+    def _positions(self, h1, h2):
+        # Double hashing: k bit positions per row from the two hashes
+        steps = np.arange(self.k, dtype=np.uint64)
+        return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bits)
+
+    def _bloom_check(self, h1, h2):
+        positions = self._positions(h1, h2)
+        bytes_, masks = positions // 8, (np.uint8(1) << (positions % 8).astype(np.uint8))
+        return np.all(self.filter[bytes_.astype(np.int64)] & masks, axis=1)
+
+    def _bloom_add(self, h1, h2):
+        positions = self._positions(h1, h2).ravel()
+        np.bitwise_or.at(self.filter, (positions // 8).astype(np.int64),
+                         np.uint8(1) << (positions % 8).astype(np.uint8))
+
+    def __call__(self, df):
+        h1, h2 = row_hashes(df, self.columns, self.normalize)
+        self.rows_seen += len(df)
+
+        # Duplicates inside the chunk first
+        fresh = ~pd.DataFrame({"h1": h1, "h2": h2}).duplicated().to_numpy()
+
+        if self.mode == "exact":
+            for i in np.flatnonzero(fresh):
+                key = (int(h1[i]) << 64) | int(h2[i])
+                if key in self.seen:
+                    fresh[i] = False
+                else:
+                    self.seen.add(key)
+        else:
+            candidates = np.flatnonzero(fresh)
+            maybe = candidates[self._bloom_check(h1[candidates], h2[candidates])]
+            self.bloom_positives += len(maybe)
+            # SQLite stores signed 64-bit integers
+            s1, s2 = h1.view(np.int64), h2.view(np.int64)
+            for i in maybe:
+                if self.db.execute("SELECT 1 FROM seen WHERE h1 = ? AND h2 = ?",
+                                   (int(s1[i]), int(s2[i]))).fetchone():
+                    fresh[i] = False
+            new = np.flatnonzero(fresh)
+            self._bloom_add(h1[new], h2[new])
+            with self.db:
+                self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?)",
+                                    zip(s1[new].tolist(), s2[new].tolist()))
+
+        self.rows_kept += int(fresh.sum())
+        return df[fresh]
+
+    def memory_bytes(self):
+        # RAM used by the dedup state (the SQLite spill file lives on disk)
+        if self.mode == "exact":
+            return sys.getsizeof(self.seen) + len(self.seen) * sys.getsizeof(1 << 127)
+        return self.filter.nbytes
+
+    def report(self):
+        # The Bloom filter is sized up front for expected_rows; the set grows with the data
+        distinct = self.rows_kept if self.mode == "exact" else self.expected_rows
+        per_million = self.memory_bytes() / max(1, distinct) * 1_000_000
+        text = (f"dedup ({self.mode}): {self.rows_seen} rows read, {self.rows_kept} kept, "
+                f"{self.memory_bytes() / 2**20:.1f} MiB in memory "
+                f"({per_million / 2**20:.1f} MiB per million distinct rows)")
+        if self.mode == "bloom":
+            text += f", {self.bloom_positives} Bloom positives verified on disk"
+        return text
+
+    def close(self):
+        if self.mode == "bloom":
+            self.db.close()
+            if self._remove_spill:
+                os.remove(self.spill_file)
+
+
+def dedupe_csv(csv_file, output_file, chunksize=100_000, **options):
+    dedupe = StreamingDeduplicator(**options)
+    try:
+        for i, chunk in enumerate(pd.read_csv(csv_file, chunksize=chunksize)):
+            dedupe(chunk).to_csv(output_file, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        print(dedupe.report())
+    finally:
+        dedupe.close()
+
+
+if __name__ == "__main__":
+    # python dedup.py input.csv output.csv [exact|bloom]
+    dedupe_csv(sys.argv[1], sys.argv[2], mode=sys.argv[3] if len(sys.argv) > 3 else "exact")
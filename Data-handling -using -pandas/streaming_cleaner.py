@@ -0,0 +1,112 @@
+# Two-pass, bounded-memory version of the Data-handling cleaning script.
+#
+# Pass 1 reads the CSV in chunks and keeps only mergeable statistics:
+#   Age    running sum and count            -> exact mean
+#   City   value counts                     -> exact mode (cities are low-cardinality)
+#   Salary t-digest quantile sketch         -> approximate median
+# Pass 2 streams the chunks again through fillna / dropna / type fixes / capping
+# and appends them to the output CSV, so memory depends on chunksize only.
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+SALARY_CAP = 1000000
+
+
+class TDigest:
+    # Small merging t-digest: about compression/2 (mean, weight) centroids summarise any
+    # number of values, and two digests merge by merging their centroids.
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # k1 scale: centroids are small near the tails and large around the median
+        cumulative = np.cumsum(weights) - weights / 2
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * cumulative / total - 1)
+        groups = np.floor(k - k.min()).astype(np.int64)
+        sums = np.bincount(groups, weights=means * weights)
+        counts = np.bincount(groups, weights=weights)
+        keep = counts > 0
+        self.means, self.weights = sums[keep] / counts[keep], counts[keep]
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        if len(other.means):
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q):
+        if not len(self.means):
+            return np.nan
+        cumulative = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.weights.sum(), cumulative, self.means))
+
+
+def gather_stats(csv_file, chunksize=100_000, dedupe=None):
+    # Pass 1: mergeable statistics over all chunks
+    age_sum, age_count = 0.0, 0
+    cities = Counter()
+    salary = TDigest()
+    for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+        ages = chunk["Age"].dropna()
+        age_sum += float(ages.sum())
+        age_count += len(ages)
+        cities.update(chunk["City"].dropna())
+        # The median is taken after rows without Salary and duplicates are dropped
+        rows = chunk.dropna(subset=["Salary"])
+        rows = dedupe(rows) if dedupe else rows.drop_duplicates()
+        salary.update(rows["Salary"].astype(float))
+
+    # Same tie-break as Series.mode()[0]: most frequent, then smallest value
+    city_mode = min(cities.items(), key=lambda item: (-item[1], item[0]))[0] if cities else None
+    return {
+        "age_mean": age_sum / age_count if age_count else np.nan,
+        "city_mode": city_mode,
+        "salary_median": salary.quantile(0.5),
+    }
+
+
+def clean_chunk(df, stats, dedupe=None):
+    df = df.copy()
+    df['Age'] = df['Age'].fillna(stats['age_mean'])
+    df['City'] = df['City'].fillna(stats['city_mode'])
+    df = df.dropna(subset=['Salary'])
+
+    # Without a cross-chunk deduplicator (dedup.py) only duplicates inside the chunk are removed
+    df = dedupe(df) if dedupe else df.drop_duplicates()
+
+    df['Salary'] = df['Salary'].astype(float)
+    df['JoinDate'] = pd.to_datetime(df['JoinDate'])
+
+    df = df.drop(['Unnamed: 0'], axis=1, errors='ignore')
+
+    df['City'] = df['City'].str.title().str.strip()
+
+    df.loc[df['Salary'] > SALARY_CAP, 'Salary'] = stats['salary_median']
+    return df
+
+
+def clean_csv_streaming(csv_file, output_file, chunksize=100_000, dedupe_factory=None):
+    # dedupe_factory() returns a fresh cross-chunk deduplicator, callable(df) -> df, for each pass
+    stats = gather_stats(csv_file, chunksize, dedupe_factory() if dedupe_factory else None)
+    dedupe = dedupe_factory() if dedupe_factory else None
+    rows = 0
+    for i, chunk in enumerate(pd.read_csv(csv_file, chunksize=chunksize)):
+        cleaned = clean_chunk(chunk, stats, dedupe)
+        cleaned.to_csv(output_file, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+        rows += len(cleaned)
+    return stats, rows
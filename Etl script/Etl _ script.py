@@ -1,30 +1,71 @@
 # ETL Script: Extract CSV → Transform → Load to SQLite
+#
+# Usage: python "Etl _ script.py"                 full reload (table is replaced)
+#        python "Etl _ script.py" --incremental   load only new/changed rows (see etl_incremental.py)
+#        python "Etl _ script.py" --stream        chunked, parallel transform, flat memory (see etl_stream.py)
+#        add --spec other_spec.json (or .yaml) to run a different transform spec
+
+import os
+import sys
 
-import pandas as pd
 import sqlite3
 
-# Step 1: Extract (read CSV)
+from etl_incremental import incremental_load
+from etl_stream import stream_etl
+from sqlite_loader import bulk_load
+from transform_spec import compile_spec
+
+# Columnar cache shared by the data scripts (CSV/columnar_cache.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CSV"))
+from columnar_cache import read_csv_cached
+
 csv_file = "sample_data.csv"  # Replace with your CSV file
-df = pd.read_csv(csv_file)
-print("Original Data:")
-print(df)
+
 
 # Step 2: Transform
-# Example transformations:
+# The transformations are declared in etl_spec.json and compiled to vectorized
+# pandas/NumPy operations (see transform_spec.py):
 # - Rename columns
 # - Filter rows (Age > 25)
-# - Create new column
+# - Create new column (AgeGroup)
+spec_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "etl_spec.json")
+if "--spec" in sys.argv:
+    spec_file = sys.argv[sys.argv.index("--spec") + 1]
+transform = compile_spec(spec_file)
+
+
+def reset_watermark(conn):
+    # A full reload invalidates the incremental watermark
+    conn.execute("DROP TABLE IF EXISTS _etl_manifest")
+    conn.execute("DROP TABLE IF EXISTS _etl_state")
+    conn.commit()
+
+
+if __name__ == "__main__":
+    conn = sqlite3.connect("etl_output.db")  # SQLite database
+
+    if "--incremental" in sys.argv:
+        # Extract, transform and upsert only the rows added or changed since the last run
+        incremental_load(csv_file, conn, "people", transform,
+                         key_column="Name", target_key_column="FullName", load=bulk_load)
+    elif "--stream" in sys.argv:
+        # Extract in chunks, transform on all cores, load chunk by chunk
+        stream_etl(csv_file, "etl_output.db", "people", transform, load=bulk_load)
+        reset_watermark(conn)
+    else:
+        # Step 1: Extract (read CSV)
+        df = read_csv_cached(csv_file)
+        print("Original Data:")
+        print(df)
 
-df = df.rename(columns={"Name": "FullName"})
-df = df[df["Age"] > 25]
-df["AgeGroup"] = df["Age"].apply(lambda x: "Adult" if x >= 18 else "Young")
+        df = transform(df)
+        print("\nTransformed Data:")
+        print(df)
 
-print("\nTransformed Data:")
-print(df)
+        # Step 3: Load into SQLite (batched executemany in one transaction, see sqlite_loader.py)
+        bulk_load(df, "people", conn, if_exists="replace")
+        reset_watermark(conn)
 
-# Step 3: Load into SQLite
-conn = sqlite3.connect("etl_output.db")  # SQLite database
-df.to_sql("people", conn, if_exists="replace", index=False)
-conn.close()
+    conn.close()
 
-print("\nData successfully loaded into 'etl_output.db' (table: people).")
+    print("\nData successfully loaded into 'etl_output.db' (table: people).")
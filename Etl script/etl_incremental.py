@@ -0,0 +1,120 @@
+# Incremental (watermark-based) loading for the ETL script.
+#
+# Two tables in the target SQLite DB remember what was loaded:
+#   _etl_state     byte offset reached in each source CSV (+ a checksum of the bytes before it)
+#   _etl_manifest  hash of the last loaded source row for every key
+# A run reads only the bytes appended since the last offset, keeps rows whose
+# hash is new or changed, transforms those and upserts them. If the file was
+# rewritten instead of appended to, it is re-read from the start and the
+# manifest still limits the work to rows that really changed.
+
+import hashlib
+import io
+import os
+import time
+
+import pandas as pd
+
+TAIL_BYTES = 256
+SETTLE_SECONDS = 2.0
+
+
+def _ensure_state_tables(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS _etl_state ("
+                 "source TEXT PRIMARY KEY, header TEXT, offset INTEGER, tail_hash TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS _etl_manifest ("
+                 "target TEXT, row_key TEXT, row_hash INTEGER, PRIMARY KEY (target, row_key))")
+
+
+def _tail_hash(file, offset):
+    start = max(0, offset - TAIL_BYTES)
+    file.seek(start)
+    return hashlib.blake2b(file.read(offset - start)).hexdigest()
+
+
+def read_delta(csv_file, conn, settle_seconds=SETTLE_SECONDS):
+    # Returns (rows appended since the last run, new offset, new tail hash)
+    source = os.path.abspath(csv_file)
+    state = conn.execute("SELECT header, offset, tail_hash FROM _etl_state WHERE source = ?",
+                         (source,)).fetchone()
+
+    with open(csv_file, "rb") as file:
+        header_line = file.readline()
+        header = header_line.decode("utf-8").strip()
+        offset = len(header_line)
+        if state is not None:
+            old_header, old_offset, old_tail = state
+            size = os.path.getsize(csv_file)
+            # Only trust the watermark if the file still starts the same way
+            if old_header == header and old_offset <= size and _tail_hash(file, old_offset) == old_tail:
+                offset = old_offset
+
+        file.seek(offset)
+        data = file.read()
+        # A last line without a newline may still be being written: hold it back for
+        # the next run, unless the file has not been modified for settle_seconds
+        if data and not data.endswith(b"\n"):
+            if time.time() - os.fstat(file.fileno()).st_mtime < settle_seconds:
+                data = data[:data.rfind(b"\n") + 1]
+        new_offset = offset + len(data)
+        new_tail = _tail_hash(file, new_offset)
+
+    columns = pd.read_csv(io.StringIO(header), nrows=0).columns.tolist()
+    if data:
+        delta = pd.read_csv(io.BytesIO(data), header=None, names=columns)
+    else:
+        delta = pd.DataFrame(columns=columns)
+    return delta, header, new_offset, new_tail
+
+
+def incremental_load(csv_file, conn, table, transform, key_column, target_key_column, load=None,
+                     settle_seconds=SETTLE_SECONDS):
+    # Loads only new or changed rows of csv_file into table; returns the number of upserted rows.
+    # load(df, table, conn) defaults to DataFrame.to_sql(..., if_exists="append").
+    _ensure_state_tables(conn)
+    if conn.execute("SELECT 1 FROM _etl_manifest WHERE target = ? LIMIT 1", (table,)).fetchone() is None:
+        # First incremental run: a table from an earlier full load has no manifest, rebuild it
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.execute("DELETE FROM _etl_state WHERE source = ?", (os.path.abspath(csv_file),))
+    delta, header, new_offset, new_tail = read_delta(csv_file, conn, settle_seconds)
+
+    # The last version of a key in the delta wins
+    delta = delta.drop_duplicates(subset=[key_column], keep="last")
+    incoming = pd.DataFrame({
+        "row_key": delta[key_column].astype(str).values,
+        "row_hash": pd.util.hash_pandas_object(delta, index=False).values.view("int64"),
+    })
+
+    with conn:
+        incoming.to_sql("_etl_incoming", conn, if_exists="replace", index=False)
+        changed_keys = pd.read_sql(
+            "SELECT i.row_key FROM _etl_incoming i "
+            "LEFT JOIN _etl_manifest m ON m.target = ? AND m.row_key = i.row_key "
+            "WHERE m.row_hash IS NULL OR m.row_hash != i.row_hash", conn, params=(table,))["row_key"]
+
+        changed = delta[delta[key_column].astype(str).isin(set(changed_keys))]
+        transformed = transform(changed)
+
+        table_exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                    (table,)).fetchone()
+        if table_exists and len(changed_keys):
+            # Changed rows may no longer pass the filter, so remove the old version first
+            conn.execute(f'DELETE FROM "{table}" WHERE CAST("{target_key_column}" AS TEXT) IN '
+                         '(SELECT row_key FROM _etl_incoming i WHERE NOT EXISTS ('
+                         'SELECT 1 FROM _etl_manifest m WHERE m.target = ? AND m.row_key = i.row_key '
+                         'AND m.row_hash = i.row_hash))', (table,))
+        if len(transformed):
+            if load is None:
+                transformed.to_sql(table, conn, if_exists="append", index=False)
+            else:
+                load(transformed, table, conn)
+
+        conn.execute("INSERT OR REPLACE INTO _etl_manifest (target, row_key, row_hash) "
+                     "SELECT ?, row_key, row_hash FROM _etl_incoming", (table,))
+        conn.execute("INSERT OR REPLACE INTO _etl_state (source, header, offset, tail_hash) "
+                     "VALUES (?, ?, ?, ?)", (os.path.abspath(csv_file), header, new_offset, new_tail))
+        conn.execute("DROP TABLE _etl_incoming")
+
+    print(f"Incremental load: {len(delta)} rows read, {len(changed)} new/changed, "
+          f"{len(transformed)} upserted into '{table}'")
+    return len(transformed)
@@ -0,0 +1,74 @@
+# Streaming ETL: read_csv(chunksize=...) → pool of transform workers → one writer thread.
+#
+# The reader submits each chunk to a process pool and puts the future on a
+# bounded queue. A single writer thread takes futures in order and commits each
+# transformed chunk in its own transaction. When the writer falls behind the
+# queue fills up and the reader blocks, so at most max_pending chunks are ever
+# in memory and peak memory stays flat however large the CSV is.
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+_DONE = object()
+
+
+def _writer(db_file, table, futures, if_exists, load, stats, errors):
+    conn = sqlite3.connect(db_file)  # sqlite connections belong to the thread that made them
+    first = True
+    try:
+        while True:
+            future = futures.get()
+            if future is _DONE:
+                break
+            if errors:
+                continue  # keep draining so the reader never blocks forever
+            try:
+                df = future.result()
+                mode = if_exists if first else "append"
+                if load is None:
+                    with conn:
+                        df.to_sql(table, conn, if_exists=mode, index=False)
+                else:
+                    load(df, table, conn, if_exists=mode)
+                first = False
+                stats["chunks"] += 1
+                stats["rows"] += len(df)
+            except Exception as e:
+                errors.append(e)
+    finally:
+        conn.close()
+
+
+def stream_etl(csv_file, db_file, table, transform, chunksize=50_000, workers=None,
+               max_pending=4, if_exists="replace", load=None):
+    # transform must be a top-level (picklable) function. Returns the number of rows written.
+    # load(df, table, conn, if_exists=...) can replace the default to_sql write.
+    futures = queue.Queue(maxsize=max_pending)
+    stats = {"chunks": 0, "rows": 0}
+    errors = []
+    writer = threading.Thread(target=_writer,
+                              args=(db_file, table, futures, if_exists, load, stats, errors))
+    start = time.perf_counter()
+    writer.start()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in pd.read_csv(csv_file, chunksize=chunksize):
+                if errors:
+                    break
+                futures.put(pool.submit(transform, chunk))  # blocks when the writer is behind
+    finally:
+        futures.put(_DONE)
+        writer.join()
+
+    if errors:
+        raise errors[0]
+    elapsed = time.perf_counter() - start
+    print(f"Streamed {stats['rows']} rows in {stats['chunks']} chunks to '{table}' "
+          f"in {elapsed:.2f}s ({stats['rows'] / elapsed if elapsed else 0:.0f} rows/sec)")
+    return stats["rows"]
@@ -0,0 +1,131 @@
+# High-throughput SQLite bulk loader for the ETL output.
+#
+# Compared with df.to_sql(table, conn):
+# - rows go in through one prepared INSERT with executemany, batch_size rows at a time
+# - the whole load is a single explicit transaction
+# - journal/synchronous pragmas are relaxed for the load window and restored afterwards
+# - indexes are created only after the data is in (index_columns)
+#
+# This is not a speed-up over to_sql to count on: to_sql already inserts with
+# executemany inside one transaction, and the benchmark below measures bulk_load
+# at x1.0-x1.2 of to_sql, both for one large load and for many small committed
+# loads (python sqlite_loader.py 200000 200). The relaxed pragmas only skip the
+# fsyncs at commit, which is cheap on most disks. What bulk_load adds is binding
+# Timestamps and nullable dtypes and joining a transaction the caller has open.
+
+import time
+
+import pandas as pd
+
+SQL_TYPES = {"i": "INTEGER", "u": "INTEGER", "b": "INTEGER", "f": "REAL", "M": "TIMESTAMP"}
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _create_table(conn, table, df):
+    columns = ", ".join(f"{_quote(c)} {SQL_TYPES.get(df[c].dtype.kind, 'TEXT')}" for c in df.columns)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({columns})")
+
+
+def _rows(df):
+    # Column-wise tolist() gives plain Python values and is far faster than itertuples.
+    # sqlite3 cannot bind pandas Timestamps, so those go in as ISO strings; NaN becomes NULL.
+    # Nullable extension dtypes (Int64, boolean, ...) hold pd.NA, which sqlite3 cannot bind either.
+    columns = []
+    for column in df.columns:
+        values = df[column]
+        if values.dtype.kind == "M":
+            values = values.astype(str).where(values.notna(), None)
+        elif isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values.tolist())
+    return zip(*columns)
+
+
+def bulk_load(df, table, conn, if_exists="append", batch_size=50_000, index_columns=()):
+    # if_exists: "append" (create the table if needed) or "replace". Returns rows/sec.
+    start = time.perf_counter()
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        # Pragmas cannot change inside a transaction; when the caller already has
+        # one open (e.g. incremental_load) we simply join it.
+        old_journal = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        old_sync = conn.execute("PRAGMA synchronous").fetchone()[0]
+        conn.execute("PRAGMA journal_mode = MEMORY")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("BEGIN")
+
+    try:
+        if if_exists == "replace":
+            conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        _create_table(conn, table, df)
+
+        insert = (f"INSERT INTO {_quote(table)} ({', '.join(_quote(c) for c in df.columns)}) "
+                  f"VALUES ({', '.join('?' * len(df.columns))})")
+        for offset in range(0, len(df), batch_size):
+            conn.executemany(insert, _rows(df.iloc[offset:offset + batch_size]))
+
+        # Building an index once at the end is much cheaper than updating it per row
+        for column in index_columns:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_{table}_{column}')} "
+                         f"ON {_quote(table)} ({_quote(column)})")
+        if own_transaction:
+            conn.commit()
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    finally:
+        if own_transaction:
+            conn.execute(f"PRAGMA journal_mode = {old_journal}")
+            conn.execute(f"PRAGMA synchronous = {old_sync}")
+
+    elapsed = time.perf_counter() - start
+    return len(df) / elapsed if elapsed else float("inf")
+
+
+if __name__ == "__main__":
+    # Benchmark: python sqlite_loader.py [rows] [loads]
+    # The rows go in as `loads` appends, each committed on its own
+    import os
+    import sqlite3
+    import sys
+    import tempfile
+
+    import numpy as np
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    loads = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "FullName": [f"name{i}" for i in range(rows)],
+        "Age": rng.integers(18, 90, rows),
+        "City": rng.choice(["Chennai", "Mumbai", "Delhi"], rows),
+        "Salary": rng.normal(50_000, 10_000, rows),
+    })
+    size = -(-rows // loads)
+    parts = [df.iloc[offset:offset + size] for offset in range(0, rows, size)]
+
+    with tempfile.TemporaryDirectory() as folder:
+        conn = sqlite3.connect(os.path.join(folder, "to_sql.db"))
+        start = time.perf_counter()
+        for part in parts:
+            part.to_sql("people", conn, if_exists="append", index=False)
+            conn.commit()
+        conn.execute("CREATE INDEX idx_people_FullName ON people (FullName)")
+        conn.commit()
+        to_sql_rate = rows / (time.perf_counter() - start)
+        conn.close()
+
+        conn = sqlite3.connect(os.path.join(folder, "bulk.db"))
+        start = time.perf_counter()
+        for i, part in enumerate(parts):
+            bulk_load(part, "people", conn, index_columns=["FullName"] if i == len(parts) - 1 else ())
+        bulk_rate = rows / (time.perf_counter() - start)
+        assert conn.execute("SELECT COUNT(*) FROM people").fetchone()[0] == rows
+        conn.close()
+
+    print(f"{rows} rows in {loads} load(s): to_sql {to_sql_rate:,.0f} rows/sec, "
+          f"bulk_load {bulk_rate:,.0f} rows/sec (x{bulk_rate / to_sql_rate:.1f})")
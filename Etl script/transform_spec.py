@@ -0,0 +1,116 @@
+# Declarative, vectorized transforms for the ETL script.
+#
+# A spec (JSON or YAML) lists the steps, applied in this order:
+#
+#   {
+#     "rename": {"Name": "FullName"},
+#     "filter": [{"column": "Age", "op": ">", "value": 25}],          # all conditions ANDed
+#     "derive": [
+#       {"column": "AgeGroup", "when": [{"if": {"column": "Age", "op": ">=", "value": 18},
+#                                        "then": "Adult"}], "else": "Young"},
+#       {"column": "AgeBand", "bins": {"column": "Age", "edges": [0, 30, 60, 200],
+#                                      "labels": ["30s-", "30-59", "60+"]}}
+#     ],
+#     "cast": {"Age": "int32"},
+#     "select": ["FullName", "Age", "AgeGroup"]
+#   }
+#
+# Every step compiles to whole-column pandas/NumPy operations (boolean masks,
+# np.select, pd.cut, astype); nothing runs a Python function per row.
+
+import json
+import operator
+
+import numpy as np
+import pandas as pd
+
+OPERATORS = {
+    "==": operator.eq, "!=": operator.ne,
+    ">": operator.gt, ">=": operator.ge,
+    "<": operator.lt, "<=": operator.le,
+}
+
+
+def load_spec(filename):
+    with open(filename, "r", encoding="utf-8") as file:
+        if filename.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("PyYAML is required for YAML specs. Install with `pip install pyyaml`") from e
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def condition_mask(df, condition):
+    column, op = df[condition["column"]], condition["op"]
+    if op in OPERATORS:
+        return OPERATORS[op](column, condition["value"])
+    if op == "in":
+        return column.isin(condition["value"])
+    if op == "not_in":
+        return ~column.isin(condition["value"])
+    if op == "isnull":
+        return column.isna()
+    if op == "notnull":
+        return column.notna()
+    raise ValueError(f"Unknown filter operator '{op}'")
+
+
+def _all_of(df, conditions):
+    if isinstance(conditions, dict):
+        conditions = [conditions]
+    mask = np.ones(len(df), dtype=bool)
+    for condition in conditions:
+        mask &= condition_mask(df, condition).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _derive(df, step):
+    if "when" in step:
+        choices = [case["then"] for case in step["when"]]
+        masks = [_all_of(df, case["if"]) for case in step["when"]]
+        default = step.get("else")
+        if all(isinstance(c, str) for c in choices + [default] if c is not None):
+            # np.select on object arrays keeps strings intact
+            return np.select(masks, np.array(choices, dtype=object), default=default)
+        return np.select(masks, choices, default=np.nan if default is None else default)
+    if "bins" in step:
+        bins = step["bins"]
+        return pd.cut(df[bins["column"]], bins=bins["edges"], labels=bins.get("labels"),
+                      right=bins.get("right", True))
+    if "copy" in step:
+        return df[step["copy"]]
+    raise ValueError(f"Derive step for '{step['column']}' needs 'when', 'bins' or 'copy'")
+
+
+class CompiledTransform:
+    # Callable transform(df) built from a spec; plain data, so it pickles to worker processes
+
+    def __init__(self, spec):
+        unknown = set(spec) - {"rename", "filter", "derive", "cast", "select"}
+        if unknown:
+            raise ValueError(f"Unknown spec sections: {sorted(unknown)}")
+        self.spec = spec
+
+    def __call__(self, df):
+        spec = self.spec
+        if spec.get("rename"):
+            df = df.rename(columns=spec["rename"])
+        if spec.get("filter"):
+            df = df[_all_of(df, spec["filter"])]
+        df = df.copy()
+        for step in spec.get("derive", []):
+            df[step["column"]] = _derive(df, step)
+        if spec.get("cast"):
+            df = df.astype(spec["cast"])
+        if spec.get("select"):
+            df = df[spec["select"]]
+        return df
+
+
+def compile_spec(spec):
+    # Accepts a spec dict or a path to a .json/.yaml file
+    if isinstance(spec, str):
+        spec = load_spec(spec)
+    return CompiledTransform(spec)
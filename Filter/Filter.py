@@ -1,6 +1,8 @@
 # A Python program to filter data and export it to Excel
 
-import pandas as pd
+import sys
+
+from excel_stream import export_filtered
 
 # Sample data: list of dictionaries
 data = [
@@ -10,13 +12,12 @@ data = [
     {"Name": "Sanjay", "Age": 28, "City": "Mumbai"},
 ]
 
-# Convert data to DataFrame
-df = pd.DataFrame(data)
-
-# Filter data: only people from Chennai
-filtered_df = df[df["City"] == "Chennai"]
+# Large sources stream from a CSV: python Filter.py people.csv [output.xlsx] [--split-files]
+source = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else data
+output = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else "filtered_data.xlsx"
+split = "file" if "--split-files" in sys.argv else "sheet"
 
-# Export filtered data to Excel
-filtered_df.to_excel("filtered_data.xlsx", index=False)
+# Filter data while reading: only people from Chennai are exported
+rows, files = export_filtered(source, output, "City", "Chennai", split=split)
 
-print("Filtered data exported to 'filtered_data.xlsx'")
+print(f"Filtered data exported to {', '.join(repr(f) for f in files)} ({rows} rows)")
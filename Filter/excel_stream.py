@@ -0,0 +1,109 @@
+# Constant-memory Excel export for filtered data.
+#
+# The source is read in chunks and the filter is applied to each chunk as it is
+# read, so only matching rows are ever converted. Rows go to an openpyxl
+# write-only workbook, which streams them to a temporary file instead of keeping
+# cell objects in memory. A sheet holds at most 1,048,576 rows (header included);
+# past that the export continues on a new sheet or in a new file.
+#
+#   export_filtered("people.csv", "filtered_data.xlsx", "City", "Chennai")
+
+import itertools
+import os
+
+import pandas as pd
+from openpyxl import Workbook
+
+EXCEL_MAX_ROWS = 1_048_576
+
+
+def read_chunks(source, chunksize=100_000, **read_options):
+    # A CSV path is read with pandas in chunks; any other iterable of dicts is batched
+    if isinstance(source, (str, os.PathLike)):
+        yield from pd.read_csv(source, chunksize=chunksize, **read_options)
+        return
+    records = iter(source)
+    while True:
+        batch = list(itertools.islice(records, chunksize))
+        if not batch:
+            break
+        yield pd.DataFrame(batch)
+
+
+class StreamingExcelWriter:
+    # split="sheet": Sheet1, Sheet2, ... in one workbook
+    # split="file":  output.xlsx, output_2.xlsx, ... one sheet each
+
+    def __init__(self, output_file, split="sheet", max_rows=EXCEL_MAX_ROWS):
+        if split not in ("sheet", "file"):
+            raise ValueError("split must be 'sheet' or 'file'")
+        self.output_file = output_file
+        self.split = split
+        self.max_rows = max_rows
+        self.header = None
+        self.workbook = None
+        self.sheet = None
+        self.sheet_rows = 0
+        self.parts = 0
+        self.files = []
+        self.rows_written = 0
+
+    def _file_name(self):
+        stem, ext = os.path.splitext(self.output_file)
+        return self.output_file if not self.files else f"{stem}_{len(self.files) + 1}{ext}"
+
+    def _new_sheet(self):
+        if self.split == "file" and self.workbook is not None:
+            self._save()
+        if self.workbook is None:
+            self.workbook = Workbook(write_only=True)
+        self.parts += 1
+        self.sheet = self.workbook.create_sheet(f"Sheet{self.parts if self.split == 'sheet' else 1}")
+        self.sheet.append(self.header)
+        self.sheet_rows = 1
+
+    def _save(self):
+        name = self._file_name()
+        self.workbook.save(name)
+        self.files.append(name)
+        self.workbook = None
+
+    def write(self, df):
+        if self.header is None:
+            self.header = [str(c) for c in df.columns]
+        # openpyxl cannot store NaN; missing values become empty cells
+        df = df.astype(object).where(df.notna(), None)
+        rows = df.itertuples(index=False, name=None)
+        while True:
+            full = self.sheet is None or self.sheet_rows >= self.max_rows
+            batch = list(itertools.islice(rows, self.max_rows - (1 if full else self.sheet_rows)))
+            if not batch:
+                break
+            if full:
+                self._new_sheet()
+            for row in batch:
+                self.sheet.append(row)
+            self.sheet_rows += len(batch)
+            self.rows_written += len(batch)
+
+    def close(self, columns=None):
+        # An export without matching rows still writes a workbook with the header
+        if self.workbook is None and not self.files:
+            self.header = self.header or list(columns or [])
+            self._new_sheet()
+        if self.workbook is not None:
+            self._save()
+        return self.files
+
+
+def export_filtered(source, output_file, column, value, chunksize=100_000, split="sheet",
+                    max_rows=EXCEL_MAX_ROWS, **read_options):
+    # Returns (rows exported, files written)
+    writer = StreamingExcelWriter(output_file, split, max_rows)
+    columns = None
+    for chunk in read_chunks(source, chunksize, **read_options):
+        columns = columns or list(chunk.columns)
+        matched = chunk[chunk[column] == value]
+        if len(matched):
+            writer.write(matched)
+    return writer.rows_written, writer.close(columns)
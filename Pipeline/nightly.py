@@ -0,0 +1,97 @@
+# Nightly job: the data scripts as cached pipeline stages (see pipeline.py).
+#
+#   sample_data.csv --clean--> cleaned_data.csv --load--> etl_output.db
+#   data.csv --aggregate--> aggregated_data.csv
+#   csv_files/ --merge--> merged_output.csv
+#
+# clean, aggregate and merge are independent and run in parallel; load waits
+# for clean. Stages whose inputs did not change since the last run are skipped.
+#
+# Usage: python nightly.py [data_dir] [--workers N] [--force stage,...]
+
+import importlib.machinery
+import importlib.util
+import os
+import sqlite3
+import sys
+
+from pipeline import Pipeline, Stage
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("Data-handling -using -pandas", "file processing /file processing", "Etl script", "CSV"):
+    sys.path.append(os.path.join(ROOT, folder))
+
+
+def clean(csv_file, output_file, chunksize=100_000):
+    # Two-pass bounded-memory cleaner with cross-chunk deduplication
+    from dedup import StreamingDeduplicator
+    from streaming_cleaner import clean_csv_streaming
+
+    dedupers = []
+
+    def new_deduplicator():
+        dedupers.append(StreamingDeduplicator())
+        return dedupers[-1]
+
+    clean_csv_streaming(csv_file, output_file, chunksize, new_deduplicator)
+    for dedupe in dedupers:
+        dedupe.close()
+
+
+def _load_script(name, path):
+    # The scripts' file names are not importable module names
+    loader = importlib.machinery.SourceFileLoader(name, path)
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    return module
+
+
+def aggregate(csv_file, output_file, chunksize=100_000):
+    # The chunked group-by of "Aggregate and group data from CSV:", same output file layout
+    script = _load_script("group_data", os.path.join(ROOT, "Aggregate and group data from CSV:"))
+    script.chunked_groupby(csv_file, chunksize).to_csv(output_file)
+
+
+def merge(folder_path, output_file, key_column="id"):
+    from file_processing import merge_csv_by_key
+
+    merge_csv_by_key(folder_path, key_column, output_file)
+
+
+def load(csv_file, db_file, table="people"):
+    # Same transform and loader as "Etl _ script.py", whose name is not importable
+    etl = _load_script("etl_script", os.path.join(ROOT, "Etl script", "Etl _ script.py"))
+
+    from columnar_cache import read_csv_cached
+    from sqlite_loader import bulk_load
+
+    conn = sqlite3.connect(db_file)
+    try:
+        bulk_load(etl.transform(read_csv_cached(csv_file)), table, conn, if_exists="replace")
+        etl.reset_watermark(conn)
+    finally:
+        conn.close()
+
+
+def nightly_pipeline(data_dir="."):
+    def path(name):
+        return os.path.join(data_dir, name)
+
+    return Pipeline([
+        Stage("clean", clean, inputs=[path("sample_data.csv")], outputs=[path("cleaned_data.csv")]),
+        Stage("aggregate", aggregate, inputs=[path("data.csv")], outputs=[path("aggregated_data.csv")]),
+        Stage("merge", merge, inputs=[path("csv_files")], outputs=[path("merged_output.csv")]),
+        Stage("load", load, inputs=[path("cleaned_data.csv")], outputs=[path("etl_output.db")]),
+    ], state_file=path(".pipeline_state.json"))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+    force = args[args.index("--force") + 1].split(",") if "--force" in args else ()
+    data_dir = args[0] if args and not args[0].startswith("--") else "."
+
+    status = nightly_pipeline(data_dir).run(workers=workers, force=force)
+    print(", ".join(f"{name}: {result}" for name, result in status.items()))
+    sys.exit(1 if "failed" in status.values() else 0)
@@ -0,0 +1,217 @@
+# Cached stage runner for chaining the data scripts.
+#
+# Each Stage declares the files it reads and writes. The runner orders stages by
+# those paths (a stage waits for every stage that writes one of its inputs),
+# runs independent stages in parallel worker processes, and memoizes results:
+# a stage's key is a hash of its code, its params and the *content* of its
+# inputs. When the key matches the last run and the outputs are still the files
+# that run produced, the stage is skipped. So an upstream stage that reruns but
+# produces identical output does not cause any downstream work.
+#
+#   pipeline = Pipeline([
+#       Stage("clean", clean, inputs=["raw.csv"], outputs=["clean.csv"]),
+#       Stage("load", load, inputs=["clean.csv"], outputs=["data.db"]),
+#   ])
+#   pipeline.run(workers=2)
+#
+# Stage functions are called as func(*inputs, *outputs, **params) and must be
+# module-level so they can be sent to worker processes. A directory input is
+# hashed by its *.csv files, the ones the merge step reads.
+
+import glob
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+STATE_FILE = ".pipeline_state.json"
+
+
+class Stage:
+
+    def __init__(self, name, func, inputs=(), outputs=(), params=None, version=1):
+        # Bump version to force a rerun after changing code the stage calls into
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+        self.version = version
+
+    def code_hash(self):
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):
+            source = f"{self.func.__module__}.{self.func.__qualname__}"
+        return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _run_stage(func, inputs, outputs, params):
+    start = time.perf_counter()
+    func(*inputs, *outputs, **params)
+    return time.perf_counter() - start
+
+
+class Pipeline:
+
+    def __init__(self, stages, state_file=STATE_FILE):
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.producers = {}
+        for stage in stages:
+            for path in stage.outputs:
+                path = os.path.abspath(path)
+                if path in self.producers:
+                    raise ValueError(f"{path} is written by both {self.producers[path]} and {stage.name}")
+                self.producers[path] = stage.name
+        self.depends_on = {stage.name: self._upstream(stage) for stage in stages}
+        self._check_cycles()
+
+    def _upstream(self, stage):
+        upstream = set()
+        for path in map(os.path.abspath, stage.inputs):
+            for output, producer in self.producers.items():
+                # An input depends on an output that is the same file or lies inside it (or vice versa)
+                if path == output or path.startswith(output + os.sep) or output.startswith(path + os.sep):
+                    upstream.add(producer)
+        upstream.discard(stage.name)
+        return upstream
+
+    def _check_cycles(self):
+        done, visiting = set(), set()
+
+        def visit(name):
+            if name in visiting:
+                raise ValueError(f"Stage dependency cycle through '{name}'")
+            if name not in done:
+                visiting.add(name)
+                for upstream in self.depends_on[name]:
+                    visit(upstream)
+                visiting.discard(name)
+                done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    # --- content hashing -------------------------------------------------
+
+    def _file_hash(self, path, hashes):
+        # Content hash, reused while size and mtime are unchanged
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        cached = hashes.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        hashes[path] = [signature, digest.hexdigest()]
+        return hashes[path][1]
+
+    def _path_hash(self, path, hashes):
+        path = os.path.abspath(path)
+        if os.path.isdir(path):
+            files = sorted(glob.glob(os.path.join(path, "*.csv")))
+            parts = [f"{os.path.basename(f)}:{self._file_hash(f, hashes)}" for f in files]
+            return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+        if not os.path.exists(path):
+            return None
+        return self._file_hash(path, hashes)
+
+    def _stage_key(self, stage, hashes):
+        inputs = {}
+        for path in stage.inputs:
+            inputs[path] = self._path_hash(path, hashes)
+            if inputs[path] is None:
+                raise FileNotFoundError(f"Stage '{stage.name}' input not found: {path}")
+        key = json.dumps([stage.code_hash(), stage.version, inputs, stage.outputs, stage.params],
+                         sort_keys=True, default=str)
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _outputs(self, stage, hashes):
+        return {path: self._path_hash(path, hashes) for path in stage.outputs}
+
+    # --- state -------------------------------------------------------------
+
+    def _load_state(self):
+        try:
+            with open(self.state_file) as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault("stages", {})
+        state.setdefault("hashes", {})
+        return state
+
+    def _save_state(self, state):
+        with open(self.state_file + ".tmp", "w") as file:
+            json.dump(state, file, indent=2)
+        os.replace(self.state_file + ".tmp", self.state_file)
+
+    # --- running -----------------------------------------------------------
+
+    def run(self, workers=None, force=()):
+        # Returns {stage name: "ran" | "cached" | "failed" | "skipped"}; force lists stages to rerun
+        workers = workers or os.cpu_count() or 1
+        state = self._load_state()
+        hashes = state["hashes"]
+        status = {}
+        pending = dict(self.stages)
+        running = {}
+
+        def start_ready(pool):
+            for name, stage in list(pending.items()):
+                upstream = self.depends_on[name]
+                if any(status.get(u) in ("failed", "skipped") for u in upstream):
+                    status[name] = "skipped"
+                    del pending[name]
+                    print(f"[{name}] skipped: an upstream stage failed")
+                elif all(u in status for u in upstream):
+                    del pending[name]
+                    try:
+                        key = self._stage_key(stage, hashes)
+                    except FileNotFoundError as e:
+                        status[name] = "failed"
+                        print(f"[{name}] failed: {e}")
+                        continue
+                    previous = state["stages"].get(name, {})
+                    if (name not in force and previous.get("key") == key
+                            and previous.get("outputs") == self._outputs(stage, hashes)):
+                        status[name] = "cached"
+                        print(f"[{name}] up to date")
+                        continue
+                    print(f"[{name}] running")
+                    future = pool.submit(_run_stage, stage.func, stage.inputs, stage.outputs, stage.params)
+                    running[future] = (name, key)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Cached stages settle immediately, so repeat until nothing new can start
+                before = len(status)
+                start_ready(pool)
+                if len(status) != before:
+                    continue
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, key = running.pop(future)
+                    try:
+                        seconds = future.result()
+                    except Exception as e:
+                        status[name] = "failed"
+                        print(f"[{name}] failed: {e!r}")
+                        continue
+                    state["stages"][name] = {"key": key, "outputs": self._outputs(self.stages[name], hashes)}
+                    self._save_state(state)
+                    status[name] = "ran"
+                    print(f"[{name}] done in {seconds:.2f}s")
+
+        self._save_state(state)
+        return status
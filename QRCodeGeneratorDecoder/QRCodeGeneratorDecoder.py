@@ -14,8 +14,71 @@ from tkinter import filedialog, messagebox
 import qrcode
 import cv2
 import os
+import sys
+import io
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image, ImageTk
 
+# Fast NumPy rasteriser shared with the QR_Generate_Decode scripts
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "QR_Generate_Decode"))
+from qr_raster import render_qr_png
+
+
+# ------------------------------------------------------------
+# Background workers
+# Purpose: Encoding, decoding and file I/O run on a thread pool so the
+#          window never freezes. Tk is not thread-safe, so finished jobs
+#          are handed back through a queue polled with root.after().
+# ------------------------------------------------------------
+executor = ThreadPoolExecutor(max_workers=2)
+finished_jobs = queue.Queue()
+POLL_MS = 50
+
+
+def run_in_background(work, on_done, *args):
+    status_label.config(text="Working...")
+    future = executor.submit(work, *args)
+    future.add_done_callback(lambda f: finished_jobs.put((on_done, f)))
+
+
+def poll_finished_jobs():
+    # Runs on the Tk main thread: deliver results of finished workers
+    while True:
+        try:
+            on_done, future = finished_jobs.get_nowait()
+        except queue.Empty:
+            break
+        status_label.config(text="")
+        error = future.exception()
+        if error is not None:
+            messagebox.showerror("Error", str(error))
+        else:
+            on_done(future.result())
+    root.after(POLL_MS, poll_finished_jobs)
+
+
+# ------------------------------------------------------------
+# Function: build_qr_png (worker thread)
+# Purpose: Encodes the QR code, saves it and returns the PNG bytes.
+# ------------------------------------------------------------
+def build_qr_png(data, filename):
+    # Create QR code with high error correction
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=10,
+        border=4
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    # Rasterise QR matrix straight to a 1-bit .png
+    png = render_qr_png(qr, fill_color="black", back_color="white")
+    with open(filename, "wb") as file:
+        file.write(png)
+    return filename, png
+
 
 # ------------------------------------------------------------
 # Function: generate_qr
@@ -36,27 +99,30 @@ def generate_qr():
     if not filename.endswith(".png"):
         filename += ".png"
 
-    # Create QR code with high error correction
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4
-    )
-    qr.add_data(data)
-    qr.make(fit=True)
-
-    # Convert QR object to image and save as .png
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(filename)
-    
-    # Notify user and display generated QR image in GUI
-    messagebox.showinfo("Success", f"QR Code saved as {filename}")
-    display_qr_image(filename)
-  
-    # Clear input fields after generation
+    # Clear input fields right away; the work continues in the background
     data_entry.delete(0, tk.END)
     filename_entry.delete(0, tk.END)
+    run_in_background(build_qr_png, on_qr_generated, data, filename)
+
+
+def on_qr_generated(result):
+    filename, png = result
+    # Show the in-memory image instead of re-reading the file from disk
+    display_qr_image(Image.open(io.BytesIO(png)))
+    messagebox.showinfo("Success", f"QR Code saved as {filename}")
+
+
+# ------------------------------------------------------------
+# Function: read_qr_file (worker thread)
+# Purpose: Loads an image file and decodes it using OpenCV.
+# ------------------------------------------------------------
+def read_qr_file(filename):
+    img = cv2.imread(filename)
+    if img is None:
+        raise ValueError("Unable to read the selected image.")
+    detector = cv2.QRCodeDetector()
+    data, bbox, _ = detector.detectAndDecode(img)
+    return data
 
 
 # ------------------------------------------------------------
@@ -74,11 +140,10 @@ def decode_qr():
         messagebox.showerror("File Error", "File not found. Please select a valid file.")
         return
     
-    # Load image and decode using OpenCV
-    img = cv2.imread(filename)
-    detector = cv2.QRCodeDetector()
-    data, bbox, _ = detector.detectAndDecode(img)
-    
+    run_in_background(read_qr_file, on_qr_decoded, filename)
+
+
+def on_qr_decoded(data):
     # Display decoded text if found
     if data:
         messagebox.showinfo("Decoded Data", f"QR Code contains:\n{data}")
@@ -95,9 +160,9 @@ def decode_qr():
 # Function: display_qr_image
 # Purpose: Displays the generated QR image in the GUI.
 # ------------------------------------------------------------
-def display_qr_image(filename):
-    img = Image.open(filename)
-    img = img.resize((200, 200))
+def display_qr_image(img):
+    # NEAREST keeps module edges sharp and is the cheapest resize
+    img = img.resize((200, 200), Image.NEAREST)
     img_tk = ImageTk.PhotoImage(img)
     qr_image_label.config(image=img_tk)
     qr_image_label.image = img_tk
@@ -129,5 +194,11 @@ tk.Button(root, text="Decode QR Code", font=("Helvetica", 12), bg="blue", fg="wh
 qr_image_label = tk.Label(root)
 qr_image_label.pack(pady=20)
 
-# Run main event loop
+# Status line shown while a background job is running
+status_label = tk.Label(root, text="", font=("Helvetica", 10), fg="gray")
+status_label.pack()
+
+# Run main event loop, polling for finished background jobs
+root.after(POLL_MS, poll_finished_jobs)
 root.mainloop()
+executor.shutdown(wait=False)
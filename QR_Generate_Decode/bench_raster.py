@@ -0,0 +1,56 @@
+# Benchmark: PIL make_image() vs the NumPy rasteriser in qr_raster.py
+# Usage: python bench_raster.py [repeats]
+
+import io
+import sys
+import time
+
+import numpy as np
+import qrcode
+from PIL import Image
+
+from qr_raster import render_qr_png
+
+
+def make_qr(data):
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def pil_png(qr):
+    buffer = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def pixels(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("L"))
+
+
+def bench(render, qrs, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for qr in qrs:
+            render(qr)
+    return len(qrs) * repeats / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    payloads = {
+        "short URL": "https://example.com/t/12345",
+        "ticket": "TICKET-" + "0123456789" * 10,
+        "long text": "x" * 1000,
+    }
+
+    for label, data in payloads.items():
+        qrs = [make_qr(data)]
+        # Both paths must produce the same pixels
+        assert np.array_equal(pixels(pil_png(qrs[0])), pixels(render_qr_png(qrs[0]))), label
+
+        pil_rate = bench(pil_png, qrs, repeats)
+        fast_rate = bench(render_qr_png, qrs, repeats)
+        print(f"{label:10} version {qrs[0].version:2}: PIL {pil_rate:8.1f}/s  "
+              f"NumPy {fast_rate:8.1f}/s  speedup x{fast_rate / pil_rate:.1f}")
@@ -0,0 +1,108 @@
+# Round-trip benchmark and correctness check for the QR generator/decoder pair.
+# Encodes payloads with the create_qr settings over a matrix of payload lengths,
+# error-correction levels and box sizes, degrades the images (noise, blur) and
+# decodes them back with every available backend.
+# Usage: python bench_roundtrip.py [repeats]
+
+import random
+import string
+import sys
+import time
+
+import cv2
+import numpy as np
+import qrcode
+
+from batch_decoder import BACKENDS, available_backends
+from qr_raster import qr_to_array
+
+PAYLOAD_LENGTHS = [10, 100, 500]
+ERROR_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+BOX_SIZES = [3, 6, 10]
+
+
+def clean(image, rng):
+    return image
+
+
+def noise(image, rng):
+    return np.clip(image + rng.normal(0, 40, image.shape), 0, 255).astype(np.uint8)
+
+
+def blur(image, rng):
+    return cv2.GaussianBlur(image, (0, 0), 1.5)
+
+
+PERTURBATIONS = {"clean": clean, "noise": noise, "blur": blur}
+
+
+def encode(data, error_correction, box_size):
+    # Same settings as create_qr (version 1, fit, border 4), rendered to a grayscale array
+    qr = qrcode.QRCode(version=1, error_correction=error_correction, box_size=box_size, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return np.where(qr_to_array(qr), 0, 255).astype(np.uint8)
+
+
+def decodes_to(name, image, data):
+    try:
+        return data in BACKENDS[name](image)
+    except Exception:
+        return False
+
+
+def payload(length, rng):
+    return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(length))
+
+
+def run(repeats=3):
+    backends = available_backends()
+    missing = set(BACKENDS) - set(backends)
+    if missing:
+        print(f"(skipping unavailable backends: {', '.join(sorted(missing))})")
+
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    header = f"{'len':>4} {'ec':>2} {'box':>3} {'encode/s':>9}"
+    for name in backends:
+        for perturbation in PERTURBATIONS:
+            header += f" {name + ':' + perturbation:>16}"
+    print(header)
+
+    totals = {}
+    for length in PAYLOAD_LENGTHS:
+        for level_name, level in ERROR_LEVELS.items():
+            for box_size in BOX_SIZES:
+                payloads = [payload(length, rng) for _ in range(repeats)]
+
+                start = time.perf_counter()
+                images = [encode(data, level, box_size) for data in payloads]
+                encode_rate = repeats / (time.perf_counter() - start)
+                row = f"{length:>4} {level_name:>2} {box_size:>3} {encode_rate:>9.1f}"
+
+                for name in backends:
+                    for perturbation, apply in PERTURBATIONS.items():
+                        degraded = [apply(image, np_rng) for image in images]
+                        start = time.perf_counter()
+                        ok = sum(decodes_to(name, image, data) for data, image in zip(payloads, degraded))
+                        rate = repeats / (time.perf_counter() - start)
+                        row += f" {ok:>2}/{repeats} {rate:>7.1f}/s"
+
+                        key = (name, perturbation)
+                        done, total = totals.get(key, (0, 0))
+                        totals[key] = (done + ok, total + repeats)
+                print(row)
+
+    print("\nDecode success rates:")
+    for (name, perturbation), (ok, total) in totals.items():
+        print(f"  {name:6} {perturbation:5}: {ok}/{total} ({100 * ok / total:.1f}%)")
+    return totals
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -1,7 +1,26 @@
+import csv
+import itertools
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
 import qrcode
 
-def create_qr(data, filename):
+from qr_raster import render_qr_png, save_qr_png
+
+def create_qr(data, filename, cache=None):
     
+    if cache is not None:
+        # Repeated payloads are served from the QRCache instead of re-encoding
+        with open(filename, "wb") as file:
+            file.write(cache.get_png(data, version=1, box_size=10, border=4))
+        print(f"QR Code saved as {filename}")
+        return
+
     qr = qrcode.QRCode(
         version=1,
         box_size=10,
@@ -11,12 +30,128 @@ def create_qr(data, filename):
     qr.make(fit=True)
 
   
-    img = qr.make_image(fill_color="black", back_color="white")
-    img.save(filename)
+    save_qr_png(qr, filename, fill_color="black", back_color="white")
     print(f"QR Code saved as {filename}")
 
 
+def qr_png_bytes(data):
+    # Same settings as create_qr, but returns the PNG instead of saving it
+    qr = qrcode.QRCode(
+        version=1,
+        box_size=10,
+        border=4
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    return render_qr_png(qr, fill_color="black", back_color="white")
+
+
+def read_records(input_file, data_column="data", name_column="name"):
+    # Yields (name, data) from a CSV file with a header row or a JSONL file
+    if input_file.endswith(".jsonl"):
+        with open(input_file, "r", encoding="utf-8") as file:
+            for index, line in enumerate(file):
+                if line.strip():
+                    record = json.loads(line)
+                    yield str(record.get(name_column) or f"{index:08d}"), str(record[data_column])
+    else:
+        with open(input_file, "r", newline="", encoding="utf-8") as file:
+            for index, row in enumerate(csv.DictReader(file)):
+                yield str(row.get(name_column) or f"{index:08d}"), row[data_column]
+
+
+def _safe_names(records):
+    # Names become file names: keep [A-Za-z0-9._-], no leading dots, and make them
+    # unique by suffixing repeats with the record index (stable across restarts).
+    # A suffixed name can itself be taken (e.g. an input named "a_00000002"),
+    # so further suffixes are added until the name is unused.
+    seen = set()
+    for index, (name, data) in enumerate(records):
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", name).lstrip(".") or f"{index:08d}"
+        base, attempt = name, 0
+        while name.lower() in seen:
+            attempt += 1
+            name = f"{base}_{index:08d}" + (f"_{attempt}" if attempt > 1 else "")
+        seen.add(name.lower())
+        yield name, data
+
+
+def _render_record(record):
+    name, data = record
+    return name, qr_png_bytes(data)
+
+
+def _write_shard_zip(path, results):
+    # Write to a temporary file first so a crash never leaves a half shard
+    tmp_path = path + ".tmp"
+    # PNGs are already deflated, so storing them is as small and much faster
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, png in results:
+            archive.writestr(f"{name}.png", png)
+    os.replace(tmp_path, path)
+
+
+def _write_shard_dir(folder, results):
+    for name, png in results:
+        path = os.path.join(folder, f"{name}.png")
+        with open(path + ".tmp", "wb") as file:
+            file.write(png)
+        os.replace(path + ".tmp", path)
+
+
+def bulk_create_qr(input_file, output, mode="zip", shard_size=10000, workers=None,
+                   data_column="data", name_column="name"):
+    # Generates one QR code per input record on a process pool.
+    # mode="zip" writes output/shard-00000.zip, ...; mode="dir" writes output/<name>.png.
+    # Finished shards are skipped on the next run, so a crashed job can simply be restarted.
+    # Names are sanitized to plain file names and made unique (see _safe_names).
+    if mode not in ("zip", "dir"):
+        raise ValueError("mode must be 'zip' or 'dir'")
+    os.makedirs(output, exist_ok=True)
+    records = _safe_names(read_records(input_file, data_column, name_column))
+    done = skipped = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for shard in itertools.count():
+            batch = list(itertools.islice(records, shard_size))
+            if not batch:
+                break
+
+            if mode == "zip":
+                shard_path = os.path.join(output, f"shard-{shard:05d}.zip")
+                if os.path.exists(shard_path):
+                    skipped += len(batch)
+                    continue
+            else:
+                pending = [r for r in batch if not os.path.exists(os.path.join(output, f"{r[0]}.png"))]
+                skipped += len(batch) - len(pending)
+                batch = pending
+                if not batch:
+                    continue
+
+            chunksize = max(1, len(batch) // ((workers or os.cpu_count() or 1) * 4))
+            results = pool.map(_render_record, batch, chunksize=chunksize)
+            if mode == "zip":
+                _write_shard_zip(shard_path, results)
+            else:
+                _write_shard_dir(output, results)
+
+            done += len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"shard {shard}: {done} generated, {skipped} skipped, {done / elapsed:.0f} codes/sec")
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {done} QR codes written to {output} in {elapsed:.1f}s ({skipped} already done)")
+    return done
+
+
 if __name__ == "__main__":
-    file_name=input("Enter your file name :")
-    data = input("Enter text or URL to generate QR code: ")
-    create_qr(data, file_name)
+    if len(sys.argv) > 2:
+        # Bulk mode: python generator.py tickets.csv out_folder [zip|dir]
+        bulk_create_qr(sys.argv[1], sys.argv[2], *sys.argv[3:4])
+    else:
+        file_name=input("Enter your file name :")
+        data = input("Enter text or URL to generate QR code: ")
+        create_qr(data, file_name)
@@ -0,0 +1,125 @@
+# Content-addressed cache for generated QR PNGs.
+# The key is a hash of everything that changes the image, so repeated payloads
+# (URLs, SKUs) are served from memory or disk instead of being re-encoded.
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import qrcode
+
+from qr_raster import render_qr_png
+
+
+def cache_key(data, version=1, error_correction=qrcode.constants.ERROR_CORRECT_M,
+              box_size=10, border=4, fill_color="black", back_color="white"):
+    settings = [data, version, error_correction, box_size, border, fill_color, back_color]
+    return hashlib.sha256(json.dumps(settings, default=list).encode("utf-8")).hexdigest()
+
+
+class QRCache:
+    # Two tiers: an in-process LRU of max_items PNGs and an optional directory
+    # capped at max_disk_bytes (least recently used files are evicted first).
+
+    def __init__(self, cache_dir=None, max_items=1024, max_disk_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_bytes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.disk_bytes = sum(entry.stat().st_size for entry in os.scandir(cache_dir)
+                                  if entry.name.endswith(".png"))
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def _remember(self, key, png):
+        self.memory[key] = png
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def _read_disk(self, key):
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as file:
+                png = file.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mark as recently used for eviction
+        return png
+
+    def _write_disk(self, key, png):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(png)
+        os.replace(tmp_path, path)
+        self.disk_bytes += len(png)
+        if self.disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted((entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".png")),
+                         key=lambda entry: entry.stat().st_mtime)
+        self.disk_bytes = sum(entry.stat().st_size for entry in entries)
+        # Trim down to 90% so we do not rescan the folder on every insert
+        target = self.max_disk_bytes * 0.9
+        for entry in entries:
+            if self.disk_bytes <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.disk_bytes -= size
+            except FileNotFoundError:
+                pass
+
+    def get_png(self, data, version=1, error_correction=qrcode.constants.ERROR_CORRECT_M,
+                box_size=10, border=4, fill_color="black", back_color="white"):
+        key = cache_key(data, version, error_correction, box_size, border, fill_color, back_color)
+
+        with self.lock:
+            png = self.memory.get(key)
+            if png is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return png
+            if self.cache_dir:
+                png = self._read_disk(key)
+                if png is not None:
+                    self.disk_hits += 1
+                    self._remember(key, png)
+                    return png
+            self.misses += 1
+
+        qr = qrcode.QRCode(version=version, error_correction=error_correction,
+                           box_size=box_size, border=border)
+        qr.add_data(data)
+        qr.make(fit=True)
+        png = render_qr_png(qr, fill_color, back_color)
+
+        with self.lock:
+            self._remember(key, png)
+            if self.cache_dir:
+                self._write_disk(key, png)
+        return png
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "disk_bytes": self.disk_bytes,
+        }
@@ -0,0 +1,176 @@
+# Fast QR localisation for large photos.
+# Candidate regions are found on a small pyramid level (high local contrast +
+# nested finder-pattern squares), then only those crops are decoded at full
+# resolution. If none of them decodes we fall back to the whole image.
+# Usage: python qr_locate.py photo.jpg        decode one photo
+#        python qr_locate.py --bench [count]  speedup on a synthetic corpus
+
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from batch_decoder import decode_image
+
+
+def pyramid_level(gray, max_side=800):
+    # Halve with pyrDown until the long side fits max_side; returns (small, scale)
+    small, scale = gray, 1
+    while max(small.shape[:2]) > max_side:
+        small = cv2.pyrDown(small)
+        scale *= 2
+    return small, scale
+
+
+def _contrast_regions(small):
+    # QR codes are dense black/white texture: strong morphological gradient everywhere inside
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, kernel)
+    _, mask = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9)))
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=2)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        fill = cv2.contourArea(contour) / float(w * h)
+        if w >= 20 and h >= 20 and 0.5 <= w / h <= 2.0 and fill > 0.5:
+            boxes.append((x, y, w, h))
+    return boxes
+
+
+def _finder_regions(small):
+    # Finder patterns are squares nested at least two levels deep
+    _, binary = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    contours, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return []
+
+    max_size = min(small.shape[:2]) // 4
+    centres = []
+    for index, contour in enumerate(contours):
+        x, y, w, h = cv2.boundingRect(contour)
+        if not (5 <= w <= max_size and 0.7 <= w / h <= 1.4):
+            continue
+        depth, child = 0, hierarchy[0][index][2]
+        while child != -1:
+            depth += 1
+            child = hierarchy[0][child][2]
+        if depth >= 2:
+            centres.append((x, y, w, h))
+
+    # Three finder patterns span the code; group the ones close to each other
+    boxes = []
+    used = set()
+    for i, (x, y, w, h) in enumerate(centres):
+        if i in used:
+            continue
+        group = [(x, y, w, h)]
+        for j in range(i + 1, len(centres)):
+            xj, yj, wj, hj = centres[j]
+            if j not in used and abs(xj - x) < 12 * w and abs(yj - y) < 12 * h:
+                group.append(centres[j])
+                used.add(j)
+        if len(group) >= 2:
+            xs = [g[0] for g in group] + [g[0] + g[2] for g in group]
+            ys = [g[1] for g in group] + [g[1] + g[3] for g in group]
+            boxes.append((min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys)))
+    return boxes
+
+
+def find_candidates(gray, max_side=800, margin=0.25):
+    # Returns full-resolution (x0, y0, x1, y1) crops, finder-pattern hits first
+    small, scale = pyramid_level(gray, max_side)
+    height, width = gray.shape[:2]
+    regions = []
+    for x, y, w, h in _finder_regions(small) + _contrast_regions(small):
+        # A crop covering most of the photo is no cheaper than the full-image fallback
+        if w * h > 0.5 * small.shape[0] * small.shape[1]:
+            continue
+        pad = int(max(w, h) * margin) + 2
+        region = (max(0, (x - pad) * scale), max(0, (y - pad) * scale),
+                  min(width, (x + w + pad) * scale), min(height, (y + h + pad) * scale))
+        if region not in regions:
+            regions.append(region)
+    return regions
+
+
+def locate_and_decode(image, backends=("cv2", "pyzbar"), max_side=800):
+    # Returns (backend, codes, used_roi)
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    codes, backend = [], None
+    for x0, y0, x1, y1 in find_candidates(gray, max_side):
+        name, found = decode_image(gray[y0:y1, x0:x1], backends)
+        for text in found:
+            if text not in codes:
+                codes.append(text)
+                backend = backend or name
+    if codes:
+        return backend, codes, True
+    backend, codes = decode_image(gray, backends)
+    return backend, codes, False
+
+
+def synthetic_photo(data, size=(3000, 4000), seed=0):
+    # Grey noisy "photo" with one QR code pasted at a random place and scale
+    import qrcode
+    rng = np.random.default_rng(seed)
+    photo = rng.normal(128, 30, size).clip(0, 255).astype(np.uint8)
+    photo = cv2.GaussianBlur(photo, (0, 0), 3)
+
+    qr = qrcode.QRCode(box_size=1, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    modules = np.pad(np.asarray(qr.modules, dtype=bool), 4)
+    side = int(rng.integers(300, 700))
+    code = cv2.resize(np.where(modules, 0, 255).astype(np.uint8), (side, side),
+                      interpolation=cv2.INTER_NEAREST)
+    y = int(rng.integers(0, size[0] - side))
+    x = int(rng.integers(0, size[1] - side))
+    photo[y:y + side, x:x + side] = code
+    return photo
+
+
+def benchmark(count=10):
+    photos = [synthetic_photo(f"https://example.com/item/{i}", seed=i) for i in range(count)]
+    totals = {"full": 0.0, "roi": 0.0}
+    hits = {"full": 0, "roi": 0}
+    roi_used = 0
+
+    for i, photo in enumerate(photos):
+        expected = f"https://example.com/item/{i}"
+
+        start = time.perf_counter()
+        _, codes = decode_image(photo)
+        totals["full"] += time.perf_counter() - start
+        hits["full"] += expected in codes
+
+        start = time.perf_counter()
+        _, codes, used_roi = locate_and_decode(photo)
+        totals["roi"] += time.perf_counter() - start
+        hits["roi"] += expected in codes
+        roi_used += used_roi
+
+    print(f"{count} synthetic {photos[0].shape[1]}x{photos[0].shape[0]} photos")
+    print(f"full image : {totals['full'] / count * 1000:7.1f} ms/photo, {hits['full']}/{count} decoded")
+    print(f"ROI first  : {totals['roi'] / count * 1000:7.1f} ms/photo, {hits['roi']}/{count} decoded "
+          f"({roi_used} via ROI)")
+    print(f"speedup x{totals['full'] / totals['roi']:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 10)
+    elif len(sys.argv) > 1:
+        image = cv2.imread(sys.argv[1], cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise FileNotFoundError(f"Unable to read image: {sys.argv[1]}")
+        backend, codes, used_roi = locate_and_decode(image)
+        for text in codes:
+            print("QR Code Data:", text)
+        if not codes:
+            print("❌ No QR code found in the image.")
+    else:
+        print("Usage: python qr_locate.py photo.jpg | --bench [count]")
@@ -0,0 +1,146 @@
+# Streaming QR scanner for video files and cameras.
+# - frames nearly identical to the last decoded frame are skipped (cheap thumbnail diff)
+# - once a code is found, the next frames are decoded in a window around it first,
+#   with a full-frame scan every few frames so new codes entering the view are found
+# - a payload is reported once and then suppressed until it has been absent for a while
+# Usage: python video_scanner.py conveyor.mp4   or   python video_scanner.py 0  (camera)
+
+import sys
+import time
+
+import cv2
+
+from batch_decoder import BACKENDS, available_backends
+
+
+class VideoQRScanner:
+
+    def __init__(self, diff_threshold=4.0, thumb_size=(64, 48), track_margin=0.5,
+                 forget_after=30, backends=("cv2", "pyzbar"), full_scan_every=10):
+        self.diff_threshold = diff_threshold  # mean abs pixel difference on the thumbnail
+        self.thumb_size = thumb_size
+        self.track_margin = track_margin
+        self.forget_after = forget_after      # frames a payload must be absent before it is reported again
+        self.backends = available_backends(backends)
+        self.full_scan_every = full_scan_every  # frames between full-frame scans while tracking
+        self.last_full_scan = None
+        self.detector = cv2.QRCodeDetector()
+        self.last_thumb = None
+        self.track_box = None                 # (x0, y0, x1, y1) of the last located code
+        self.last_seen = {}                   # payload -> frame index
+        self.stats = {"frames": 0, "skipped": 0, "decode_calls": 0, "tracked_hits": 0, "reported": 0}
+
+    def _is_duplicate_frame(self, gray):
+        thumb = cv2.resize(gray, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if self.last_thumb is not None:
+            if cv2.absdiff(thumb, self.last_thumb).mean() < self.diff_threshold:
+                return True, thumb
+        return False, thumb
+
+    def _box(self, points, offset):
+        xs, ys = points[..., 0], points[..., 1]
+        return (int(xs.min()) + offset[0], int(ys.min()) + offset[1],
+                int(xs.max()) + offset[0], int(ys.max()) + offset[1])
+
+    def _decode(self, gray, offset=(0, 0), fallback=True):
+        # Returns (codes, box) where box is the bounding box of all located codes in frame coordinates
+        self.stats["decode_calls"] += 1
+        found, texts, points, _ = self.detector.detectAndDecodeMulti(gray)
+        codes = [text for text in texts if text] if found else []
+        if codes and points is not None:
+            return codes, self._box(points, offset)
+        if not fallback:
+            return codes, None
+        # Only the detectors not tried yet: cv2's single-code detector, then pyzbar
+        for name in self.backends:
+            if name == "cv2":
+                text, points, _ = self.detector.detectAndDecode(gray)
+                if text:
+                    return [text], self._box(points, offset) if points is not None else None
+            else:
+                try:
+                    codes = BACKENDS[name](gray)
+                except Exception:
+                    continue
+                if codes:
+                    return codes, None
+        return [], None
+
+    def _tracked_window(self, shape):
+        x0, y0, x1, y1 = self.track_box
+        pad_x = int((x1 - x0) * self.track_margin)
+        pad_y = int((y1 - y0) * self.track_margin)
+        return (max(0, x0 - pad_x), max(0, y0 - pad_y),
+                min(shape[1], x1 + pad_x), min(shape[0], y1 + pad_y))
+
+    def process(self, frame):
+        # Returns the list of new payloads found in this frame
+        index = self.stats["frames"]
+        self.stats["frames"] += 1
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        duplicate, thumb = self._is_duplicate_frame(gray)
+        if duplicate:
+            self.stats["skipped"] += 1
+            # The same code is still in view, keep it suppressed
+            for payload in self.last_seen:
+                if index - self.last_seen[payload] <= 1:
+                    self.last_seen[payload] = index
+            return []
+
+        codes, box = [], None
+        if self.track_box is not None:
+            # The window only needs the fast multi detector; a miss falls through to the full frame
+            x0, y0, x1, y1 = self._tracked_window(gray.shape)
+            codes, box = self._decode(gray[y0:y1, x0:x1], offset=(x0, y0), fallback=False)
+            if codes:
+                self.stats["tracked_hits"] += 1
+        due = self.last_full_scan is None or index - self.last_full_scan >= self.full_scan_every
+        if not codes or due:
+            tracked, tracked_box = codes, box
+            codes, box = self._decode(gray)
+            self.last_full_scan = index
+            if tracked:
+                codes = list(dict.fromkeys(tracked + codes))
+                box = box or tracked_box
+        self.track_box = box if codes else None
+        self.last_thumb = thumb
+
+        new = []
+        for payload in codes:
+            previous = self.last_seen.get(payload)
+            if previous is None or index - previous > self.forget_after:
+                new.append(payload)
+            self.last_seen[payload] = index
+        self.stats["reported"] += len(new)
+        return new
+
+    def scan(self, source):
+        # Yields (frame_index, payload) for every new payload in a video file or camera index
+        capture = cv2.VideoCapture(source)
+        if not capture.isOpened():
+            raise FileNotFoundError(f"Unable to open video source: {source}")
+        try:
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                for payload in self.process(frame):
+                    yield self.stats["frames"] - 1, payload
+        finally:
+            capture.release()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python video_scanner.py video.mp4 | camera_index")
+        sys.exit(1)
+    source = int(sys.argv[1]) if sys.argv[1].isdigit() else sys.argv[1]
+    scanner = VideoQRScanner()
+    start = time.perf_counter()
+    for frame_index, payload in scanner.scan(source):
+        print(f"frame {frame_index}: {payload}")
+    elapsed = time.perf_counter() - start
+    stats = scanner.stats
+    print(f"✅ {stats['frames']} frames in {elapsed:.1f}s, {stats['decode_calls']} decode calls, "
+          f"{stats['skipped']} skipped, {stats['tracked_hits']} tracked, {stats['reported']} codes reported")
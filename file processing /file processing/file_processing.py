@@ -2,20 +2,290 @@
 
 import pandas as pd
 import glob
+import csv
+import itertools
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Columnar cache shared by the data scripts (CSV/columnar_cache.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "CSV"))
+from columnar_cache import read_csv_cached
+
+SCHEMA_FILE = ".csv_schema.json"
+
+
+def _load_schema(folder_path):
+    try:
+        with open(os.path.join(folder_path, SCHEMA_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_schema(folder_path, schema):
+    path = os.path.join(folder_path, SCHEMA_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(schema, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def _file_version(file):
+    stat = os.stat(file)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_with_schema(file, entry, key_column):
+    # Returns (df, schema entry to save or None if the cached one was used, seconds).
+    # The key column is always read as text; _unify_keys picks one type for all files.
+    start = time.perf_counter()
+    version = _file_version(file)
+    key_dtype = {key_column: str} if key_column else {}
+    if entry and entry.get("version") == version:
+        try:
+            dtypes = entry["dtypes"]
+            header = list(pd.read_csv(file, nrows=0).columns)
+            if set(header) == set(dtypes):
+                df = read_csv_cached(file, dtype={**dtypes, **key_dtype})
+                return df, None, time.perf_counter() - start
+        except (KeyError, ValueError, TypeError):
+            pass  # unreadable entry: infer again
+    df = read_csv_cached(file, dtype=key_dtype)
+    entry = {"version": version, "dtypes": {c: str(t) for c, t in df.dtypes.items()}}
+    return df, entry, time.perf_counter() - start
+
+
+def _unify_keys(frames, key_column):
+    # Numeric keys only if every file's keys parse as numbers, so all files share one key type
+    try:
+        keys = [pd.to_numeric(df[key_column]) for df in frames]
+    except (ValueError, TypeError):
+        return frames
+    return [df.assign(**{key_column: key}) for df, key in zip(frames, keys)]
+
+
+def read_csv_files(folder_path, csv_files, key_column=None, workers=None, verbose=True):
+    # Reads the CSVs concurrently. The dtypes inferred for each file are saved in
+    # folder_path/.csv_schema.json with the file's size and mtime, so later runs pass
+    # explicit dtypes and skip inference until the file changes.
+    schema = _load_schema(folder_path)
+    names = [os.path.basename(file) for file in csv_files]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_read_with_schema, csv_files, [schema.get(n) for n in names],
+                                [key_column] * len(csv_files)))
+
+    changed = False
+    for name, (df, inferred, seconds) in zip(names, results):
+        if inferred is not None:
+            schema[name] = inferred
+            changed = True
+        if verbose:
+            source = "inferred" if inferred is not None else "cached schema"
+            print(f"  read {name}: {len(df)} rows in {seconds * 1000:.1f} ms ({source})")
+    if changed:
+        _save_schema(folder_path, schema)
+    frames = [df for df, _, _ in results]
+    return _unify_keys(frames, key_column) if key_column else frames
+
+
+def _unique_columns(frames, csv_files, key_column):
+    # pd.merge would add _x/_y suffixes to clashing columns; here a clash gets the file name instead
+    seen = {key_column}
+    renamed = []
+    for df, file in zip(frames, csv_files):
+        stem = os.path.splitext(os.path.basename(file))[0]
+        mapping = {c: f"{c}_{stem}" for c in df.columns if c in seen and c != key_column}
+        seen.update(mapping.get(c, c) for c in df.columns)
+        renamed.append(df.rename(columns=mapping) if mapping else df)
+    return renamed
+
+
+def kway_merge(frames, csv_files, key_column):
+    # Index every frame on the key once and outer-join them all in a single concat,
+    # instead of re-hashing and copying the growing result once per file
+    frames = _unique_columns(frames, csv_files, key_column)
+    if any(df[key_column].duplicated().any() for df in frames):
+        # Duplicate keys need merge's many-to-many semantics
+        merged_df = frames[0]
+        for df in frames[1:]:
+            merged_df = pd.merge(merged_df, df, on=key_column, how='outer')
+        # Same column order as the concat path: key first
+        return merged_df[[key_column] + [c for c in merged_df.columns if c != key_column]]
+    indexed = [df.set_index(key_column) for df in frames]
+    merged_df = pd.concat(indexed, axis=1, join='outer').sort_index()
+    merged_df.index.name = key_column
+    return merged_df.reset_index()
+
+
+def _next_run(group, previous, file):
+    # (key, rows) for the next run of equal keys in one file, or None at the end
+    run = next(group, None)
+    if run is None:
+        return None
+    if previous is not None and run[0] < previous[0]:
+        raise ValueError(f"{file} is not sorted by key: {run[0]!r} comes after {previous[0]!r}")
+    return run[0], list(run[1])
+
+
+def _detect_key_type(csv_files, key_column, sample_rows=1000):
+    # int if every sampled key parses as int, else float, else str
+    keys = []
+    for file in csv_files:
+        with open(file, newline='') as f:
+            keys.extend(row[key_column] for row in itertools.islice(csv.DictReader(f), sample_rows))
+    for key_type in (int, float):
+        try:
+            for key in keys:
+                key_type(key)
+            return key_type
+        except ValueError:
+            continue
+    return str
+
+
+def sorted_merge(csv_files, key_column, output_file, key_type=None):
+    # Streaming merge for inputs already sorted by key_column. Keys are compared as
+    # key_type, detected from the first rows when not given; an input whose keys go
+    # backwards raises ValueError. Only the current run of rows per file is held in memory.
+    key_type = key_type or _detect_key_type(csv_files, key_column)
+    files = [open(file, newline='') for file in csv_files]
+    try:
+        readers = [csv.DictReader(f) for f in files]
+        headers = [[c for c in r.fieldnames if c != key_column] for r in readers]
+        unique = _unique_columns([pd.DataFrame(columns=r.fieldnames) for r in readers], csv_files, key_column)
+        out_headers = [[c for c in df.columns if c != key_column] for df in unique]
+
+        groups = [itertools.groupby(r, key=lambda row: key_type(row[key_column])) for r in readers]
+        heads = [_next_run(g, None, file) for g, file in zip(groups, csv_files)]
+
+        with open(output_file, 'w', newline='') as out:
+            writer = csv.writer(out)
+            writer.writerow([key_column] + [c for h in out_headers for c in h])
+            while any(heads):
+                key = min(h[0] for h in heads if h)
+                parts = []
+                key_text = None  # written as it appears in the first file that has it
+                for i, head in enumerate(heads):
+                    if head and head[0] == key:
+                        key_text = key_text or head[1][0][key_column]
+                        parts.append([[row[c] for c in headers[i]] for row in head[1]])
+                        heads[i] = _next_run(groups[i], head, csv_files[i])
+                    else:
+                        parts.append([[''] * len(headers[i])])
+                # Many-to-many keys produce every combination, like pd.merge
+                for combo in itertools.product(*parts):
+                    writer.writerow([key_text] + [v for part in combo for v in part])
+    finally:
+        for f in files:
+            f.close()
+
+
+def _rows_per_chunk(file, memory_budget):
+    # Rough rows-per-chunk estimate from the average line length (pandas needs ~4x the text size)
+    with open(file, 'rb') as f:
+        sample = f.read(65536)
+    line_bytes = max(1, len(sample) // max(1, sample.count(b'\n')))
+    return max(1000, memory_budget // (line_bytes * 4))
+
+
+def _partition_files(file_index, file, key_column, partitions, spill_dir, memory_budget):
+    # Hash-partition one input CSV by key into spill_dir/part<p>/<file_index>.csv
+    written = set()
+    for chunk in pd.read_csv(file, dtype={key_column: str}, chunksize=_rows_per_chunk(file, memory_budget)):
+        # hash_array is deterministic, so equal keys land in the same partition for every file
+        part_ids = pd.util.hash_array(chunk[key_column].fillna('').to_numpy(dtype=object)) % partitions
+        for part, rows in chunk.groupby(part_ids):
+            path = os.path.join(spill_dir, f"part{part}", f"{file_index}.csv")
+            rows.to_csv(path, mode='a', header=path not in written, index=False)
+            written.add(path)
+
+
+def _merge_partition(part, csv_files, headers, key_column, spill_dir, out_columns):
+    frames = []
+    for i, columns in enumerate(headers):
+        path = os.path.join(spill_dir, f"part{part}", f"{i}.csv")
+        if os.path.exists(path):
+            frames.append(pd.read_csv(path, dtype={key_column: str}))
+        else:
+            frames.append(pd.DataFrame(columns=columns))
+    out_path = os.path.join(spill_dir, f"merged{part}.csv")
+    # Every part is written with the same columns, since they are concatenated under one header
+    kway_merge(frames, csv_files, key_column)[out_columns].to_csv(out_path, index=False)
+    return out_path
+
+
+def external_merge(csv_files, key_column, output_file, partitions=None,
+                   memory_budget=512 * 1024 * 1024, workers=None, tmp_dir=None):
+    # Out-of-core outer merge: hash-partition every input by key into spill files,
+    # merge partition by partition in parallel, then concatenate the results.
+    # memory_budget (bytes) is shared by all workers; partitions defaults to a count
+    # that keeps one partition of every input well inside a worker's share.
+    # Rows come out grouped by partition, not sorted by key.
+    workers = workers or os.cpu_count() or 1
+    if partitions is None:
+        total = sum(os.path.getsize(file) for file in csv_files)
+        partitions = max(1, math.ceil(total * 4 * workers / memory_budget))
+    headers = [list(pd.read_csv(file, nrows=0).columns) for file in csv_files]
+    unique = _unique_columns([pd.DataFrame(columns=h) for h in headers], csv_files, key_column)
+    out_columns = [key_column] + [c for df in unique for c in df.columns if c != key_column]
+
+    spill_dir = tempfile.mkdtemp(prefix='csv_merge_', dir=tmp_dir)
+    try:
+        for part in range(partitions):
+            os.makedirs(os.path.join(spill_dir, f"part{part}"))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            budget = memory_budget // workers
+            list(pool.map(_partition_files, range(len(csv_files)), csv_files,
+                          [key_column] * len(csv_files), [partitions] * len(csv_files),
+                          [spill_dir] * len(csv_files), [budget] * len(csv_files)))
+            merged_parts = list(pool.map(_merge_partition, range(partitions),
+                                         [csv_files] * partitions, [headers] * partitions,
+                                         [key_column] * partitions, [spill_dir] * partitions,
+                                         [out_columns] * partitions))
+
+        with open(output_file, 'wb') as out:
+            for i, path in enumerate(merged_parts):
+                with open(path, 'rb') as part_file:
+                    if i > 0:
+                        part_file.readline()  # every part has the same header
+                    shutil.copyfileobj(part_file, out)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+def merge_csv_by_key(folder_path, key_column, output_file, mode='kway', key_type=None, **external_options):
+    # mode: 'kway' (single concat), 'sorted' (streaming, inputs sorted by key),
+    # 'external' (larger than RAM, options: partitions, memory_budget, workers, tmp_dir)
+    # or 'pairwise' (old behaviour)
 
-def merge_csv_by_key(folder_path, key_column, output_file):
-    
     csv_files = glob.glob(folder_path + "/*.csv")
-    
-    
-    merged_df = pd.read_csv(csv_files[0])
-    
-    
-    for file in csv_files[1:]:
-        df = pd.read_csv(file)
-        merged_df = pd.merge(merged_df, df, on=key_column, how='outer')
-    
-    
+
+    if mode == 'external':
+        external_merge(csv_files, key_column, output_file, **external_options)
+        print(f"✅ Merged CSV saved successfully as: {output_file}")
+        return
+
+    if mode == 'sorted':
+        sorted_merge(csv_files, key_column, output_file, key_type)
+        print(f"✅ Merged CSV saved successfully as: {output_file}")
+        return
+
+    frames = read_csv_files(folder_path, csv_files, key_column)
+
+    if mode == 'pairwise':
+        merged_df = frames[0]
+        for df in frames[1:]:
+            merged_df = pd.merge(merged_df, df, on=key_column, how='outer')
+    else:
+        merged_df = kway_merge(frames, csv_files, key_column)
+
+
     merged_df.to_csv(output_file, index=False)
     print(f"✅ Merged CSV saved successfully as: {output_file}")
 
@@ -24,5 +294,5 @@ if __name__ == "__main__":
     folder = "csv_files"       # Folder containing CSVs
     key = "id"                 # Common column to merge on
     output = "merged_output.csv"
-    
+
     merge_csv_by_key(folder, key, output)